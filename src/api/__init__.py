@@ -0,0 +1,8 @@
+import os
+
+# Concurrency in the API comes from the search thread pool, so each numeric
+# call (BLAS in numpy, OpenMP in FAISS) gets a single thread; per-call thread
+# pools on top of it would oversubscribe the cores. This runs on package import,
+# before numpy or faiss are first loaded; explicit environment values still win.
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
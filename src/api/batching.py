@@ -0,0 +1,113 @@
+"""Micro-batching of concurrent search requests.
+
+Embedding models and vector indexes are far cheaper per query when they
+receive a batch (one matrix product instead of many vector products). This
+module collects the queries that arrive within a short window and serves them
+with a single batched search call.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+BatchSearchFn = Callable[[List[str], int], List[List[Tuple[Document, float]]]]
+
+class SearchBatcher:
+    """
+    Coalesces concurrent `(query, k)` requests into batched search calls.
+
+    Requests are queued on the event loop; a background task drains up to
+    `max_batch` of them (waiting at most `max_wait_ms` after the first one),
+    runs one batched search on the executor, and resolves each caller's future
+    with its own top-k slice.
+
+    Attributes:
+        max_batch (int): Upper bound on queries per batched call.
+        max_wait (float): Collection window in seconds.
+    """
+
+    def __init__(self, search_fn: BatchSearchFn, executor: Executor, max_batch: int = 32, max_wait_ms: float = 5.0):
+        """
+        Initializes the batcher.
+
+        Args:
+            search_fn (BatchSearchFn): Blocking function serving a list of queries with a shared k.
+            executor (Executor): Pool the blocking search runs on.
+            max_batch (int): Upper bound on queries per batched call.
+            max_wait_ms (float): How long to wait for more queries after the first one.
+        """
+        self._search_fn = search_fn
+        self._executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def search(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        """
+        Queues a query and waits for its slice of the next batched search.
+
+        Args:
+            query (str): The raw search query.
+            k (int): Number of results to return.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents paired with relevance scores.
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((query, k, future))
+        return await future
+
+    async def close(self) -> None:
+        """Cancels the background worker, if one is running."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        """Starts the drain task on the running loop (restarting it if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Drains the queue forever, dispatching one batched search per window."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[str, int, asyncio.Future]]) -> None:
+        """Runs one batched search and routes each result to its waiting caller."""
+        # Top-k results are sorted, so each caller's answer is a prefix of the max-k answer.
+        max_k = max(k for _, k, _ in batch)
+        queries = [query for query, _, _ in batch]
+        try:
+            results = await self._loop.run_in_executor(self._executor, self._search_fn, queries, max_k)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, k, future), docs_with_scores in zip(batch, results):
+            if not future.done():
+                future.set_result(docs_with_scores[:k])
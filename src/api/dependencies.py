@@ -0,0 +1,54 @@
+"""Shared dependencies for the FastAPI layer.
+
+This module owns the long-lived resources used by the request handlers, so
+they are created once per worker process instead of once per request.
+"""
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+from src.api.batching import SearchBatcher
+from src.config import settings
+from src.retrieval.base import BaseVectorDB
+from src.retrieval.vector_db import get_vector_db
+
+# Blocking retrieval work (query embedding + ANN search) runs on this pool
+# so the event loop stays free to accept other requests.
+SEARCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.search_max_workers,
+    thread_name_prefix="search"
+)
+
+def get_db() -> BaseVectorDB:
+    """
+    Returns the process-wide vector database wrapper.
+
+    The factory memoizes the instance (see `get_vector_db`), and the wrapper
+    caches its underlying store after the first access, so the index stays
+    loaded between requests.
+
+    Returns:
+        BaseVectorDB: The configured vector database instance.
+    """
+    return get_vector_db()
+
+# Concurrent `/search` requests are coalesced into one embedding + index call.
+SEARCH_BATCHER = SearchBatcher(
+    lambda queries, k: get_db().batch_similarity_search(queries, k),
+    SEARCH_EXECUTOR,
+    max_batch=settings.search_max_batch,
+    max_wait_ms=settings.search_max_wait_ms
+)
+
+# Bounds the `/search` requests being served at once, so memory for query
+# vectors, hits and encoded responses stays predictable under load; the rest
+# queue cheaply on the event loop. With the batcher, this also caps batch size.
+SEARCH_SEMAPHORE = asyncio.Semaphore(settings.max_concurrent_searches)
+
+# Encoded `/search` response bodies keyed by (normalized query, k, store generation),
+# in LRU order. Results only change at ingestion, which writes a new generation
+# next to the store (see `store_generation`), so entries from before an ingestion,
+# in this process or the CLI, are never served again.
+SEARCH_RESULT_CACHE: "OrderedDict[Tuple[str, int, str], bytes]" = OrderedDict()
@@ -4,14 +4,32 @@ This module serves as the primary API layer, providing endpoints for
 semantic document retrieval and serving frontend assets.
 """
 
+import asyncio
 import os
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+import msgspec
+import numpy as np
+import orjson
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import Annotated, List, Dict, Any, Tuple
+from typing_extensions import TypedDict
 
-from src.retrieval.vector_db import get_vector_db
+from langchain_core.documents import Document
+
+from src.api.dependencies import (
+    SEARCH_BATCHER,
+    SEARCH_EXECUTOR,
+    SEARCH_RESULT_CACHE,
+    SEARCH_SEMAPHORE,
+    get_db
+)
+from src.generation.llm import get_rag
+from src.config import EmbeddingProvider, settings
+from src.retrieval.vector_db import store_generation
 from src.utils import setup_logger
 
 # Initialize Logger
@@ -21,22 +39,82 @@ logger = setup_logger(__name__)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 STATIC_DIR = os.path.join(BASE_DIR, "static")
 
+# Results below this cosine relevance are dropped as low-confidence matches
+SIMILARITY_THRESHOLD = 0.3
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warms the vector store before the first request is served.
+
+    Opening the store loads the index from disk, so doing it here keeps
+    that latency off the first `/search` call. A local embedding model also
+    runs one throwaway query, since its first forward pass (memory
+    allocation, kernel selection) is far slower than the rest; remote
+    providers are not called, as that would bill a request per startup.
+    The threadpool for sync work is capped at the core count, since BLAS is
+    pinned to one thread per call. On shutdown the search batcher's
+    background task is stopped.
+    """
+    to_thread.current_default_thread_limiter().total_tokens = os.cpu_count() or 1
+    try:
+        db = get_db()
+        _ = db.store
+        if settings.embedding_provider is EmbeddingProvider.HUGGINGFACE:
+            # The raw model, so the throwaway query stays out of the query caches
+            db.embeddings.inner.embed_query("warmup")
+        logger.info("Vector store warmed up.")
+    except Exception as e:
+        # The API must still boot so `/` is served; `/search` reports the error.
+        logger.warning(f"Vector store not warmed up: {e}")
+    yield
+    await SEARCH_BATCHER.close()
+
 app = FastAPI(
     title="SoluGen AI RAG Assignment",
     description="Professional Vector Search API for HR and Recruitment Data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 class SearchRequest(BaseModel):
-    """Schema for incoming semantic search requests."""
+    """Schema for incoming semantic search requests (documentation only; see `SearchQuery`)."""
     query: str = Field(..., json_schema_extra={"example": "Python developer..."})
     k: int = Field(default=5, ge=1, le=20, description="Number of results to return")
 
+class SearchQuery(msgspec.Struct):
+    """msgspec mirror of `SearchRequest`, used to decode `/search` bodies."""
+    query: str
+    k: Annotated[int, msgspec.Meta(ge=1, le=20)] = 5
+
+class SearchResult(TypedDict):
+    """A single formatted search hit."""
+    content: str
+    source: str
+    job_title: str
+    score: float
+    id: Any
+
 class SearchResponse(BaseModel):
-    """Schema for structured retrieval results."""
-    results: List[Dict[str, Any]]
+    """Schema for structured retrieval results (documentation only; see `search`)."""
+    results: List[SearchResult]
+
+class RAGRequest(BaseModel):
+    """Schema for incoming question-answering requests."""
+    question: str = Field(..., min_length=1, json_schema_extra={"example": "Which roles need T-SQL?"})
+
+class RAGResponse(BaseModel):
+    """Schema for a generated answer."""
+    answer: str
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded by orjson, which serializes strings and floats in native code."""
+
+    def render(self, content: Any) -> bytes:
+        """Encodes the content to JSON bytes."""
+        return orjson.dumps(content)
 
 @app.get("/", tags=["UI"])
 async def read_root() -> FileResponse:
@@ -51,58 +129,152 @@ async def read_root() -> FileResponse:
         raise HTTPException(status_code=404, detail="Frontend assets missing")
     return FileResponse(index_path)
 
-@app.post("/search", response_model=SearchResponse, tags=["Search"])
-async def search(request: SearchRequest) -> Dict[str, Any]:
+def _format_results(docs_with_scores: List[Tuple[Document, float]]) -> List[SearchResult]:
+    """
+    Applies the similarity threshold and maps documents to the response schema.
+
+    Thresholding and rounding run as single NumPy operations over the score
+    vector; only the surviving documents are touched in Python.
+
+    Args:
+        docs_with_scores (List[Tuple[Document, float]]): Search hits, best first.
+
+    Returns:
+        List[SearchResult]: The formatted results above the threshold.
+    """
+    scores = np.fromiter((score for _, score in docs_with_scores), dtype=np.float64, count=len(docs_with_scores))
+    kept = np.flatnonzero(scores >= SIMILARITY_THRESHOLD)
+    kept_scores = np.round(scores[kept], 4).tolist()
+
+    results = []
+    for i, score in zip(kept.tolist(), kept_scores):
+        doc = docs_with_scores[i][0]
+        metadata = doc.metadata
+        results.append({
+            "content": doc.page_content,
+            "source": metadata.get("source", "Unknown"),
+            "job_title": metadata.get("source", "N/A"),
+            "score": score,
+            "id": metadata.get("row", "N/A")
+        })
+    return results
+
+def _cache_result(key: Tuple[str, int, str], body: bytes) -> None:
+    """Stores an encoded `/search` body, evicting the least recently used one when full."""
+    if settings.search_result_cache_size <= 0:
+        return
+    SEARCH_RESULT_CACHE[key] = body
+    SEARCH_RESULT_CACHE.move_to_end(key)
+    while len(SEARCH_RESULT_CACHE) > settings.search_result_cache_size:
+        SEARCH_RESULT_CACHE.popitem(last=False)
+
+@app.post(
+    "/search",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": SearchResponse}},
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": SearchRequest.model_json_schema()}},
+            "required": True
+        }
+    },
+    tags=["Search"]
+)
+async def search(request: Request) -> ORJSONResponse:
     """
     Performs a semantic search using cosine relevance scores.
 
     This implementation accesses the underlying vector store property to 
-    provide similarity scores and chunk-level transparency.
+    provide similarity scores and chunk-level transparency. The search itself
+    is blocking (query embedding + ANN lookup), so it is handed to the search
+    batcher, which coalesces concurrent queries into one call and runs it on
+    the search executor to keep the event loop responsive. At most
+    `settings.max_concurrent_searches` requests are searched at once.
+
+    The body is decoded and validated by msgspec in one pass, and the results
+    are built by `_format_results` in the documented shape, so they are
+    encoded directly with orjson, skipping response-model validation and
+    `jsonable_encoder`. Encoded bodies are cached per (query, k) until the
+    next ingestion, so repeated searches skip embedding, search and encoding
+    entirely.
 
     Args:
-        request (SearchRequest): Search parameters (query and Top-K).
+        request (Request): The raw request; its body matches `SearchRequest`.
 
     Returns:
-        Dict[str, Any]: Formatted results meeting the 0.3 similarity threshold.
+        ORJSONResponse: Formatted results meeting the 0.3 similarity threshold.
 
     Raises:
-        HTTPException: 500 if the search engine fails or DB is missing.
+        HTTPException: 422 for a malformed body, 500 if the search engine fails or DB is missing.
     """
     try:
-        if not request.query.strip():
-            return {"results": []}
-
-        # 1. Retrieve the database wrapper and the internal store instance
-        vector_db_wrapper = get_vector_db()
-        store = vector_db_wrapper.store 
-        
-        # 2. Execute Similarity Search with Raw Relevance Scores
-        # Result: List[Tuple[Document, float]]
-        docs_with_scores = store.similarity_search_with_relevance_scores(
-            request.query, 
-            k=request.k
-        )
-
-        # 3. Filtering and Formatting
-        SIMILARITY_THRESHOLD = 0.3  
-        formatted_results = []
-        
-        for doc, score in docs_with_scores:
-            if score >= SIMILARITY_THRESHOLD:
-                formatted_results.append({
-                    "content": doc.page_content,
-                    "source": doc.metadata.get("source", "Unknown"),
-                    "job_title": doc.metadata.get("source", "N/A"),
-                    "score": round(float(score), 4),
-                    "id": doc.metadata.get("row", "N/A")
-                })
-
-        logger.info(f"Retrieved {len(formatted_results)} results for: '{request.query}'")
-        return {"results": formatted_results}
+        params = msgspec.json.decode(await request.body(), type=SearchQuery)
+    except msgspec.DecodeError as e:
+        # ValidationError subclasses DecodeError, so this covers bad JSON and bad fields
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        if not params.query.strip():
+            return ORJSONResponse({"results": []})
+
+        # Whitespace differences do not change the query's meaning; read before
+        # searching, so results that raced an ingestion are filed as stale
+        cache_key = (" ".join(params.query.split()), params.k, store_generation())
+        cached = SEARCH_RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            SEARCH_RESULT_CACHE.move_to_end(cache_key)
+            return Response(content=cached, media_type="application/json")
+
+        async with SEARCH_SEMAPHORE:
+            # 1-2. Execute Similarity Search with Raw Relevance Scores via the batcher
+            # Result: List[Tuple[Document, float]]
+            docs_with_scores = await SEARCH_BATCHER.search(params.query, params.k)
+
+            # 3. Filtering and Formatting
+            formatted_results = _format_results(docs_with_scores)
+
+            # Per-request line: debug-only, formatted lazily
+            logger.debug("Retrieved %d results for: '%s'", len(formatted_results), params.query)
+            response = ORJSONResponse({"results": formatted_results})
+            _cache_result(cache_key, response.body)
+            return response
 
     except FileNotFoundError as e:
         logger.error(f"Search failed: {e}")
         raise HTTPException(status_code=503, detail="Search database not initialized. Run ingestion.")
     except Exception as e:
         logger.error(f"Critical search error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Search Engine Error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal Search Engine Error")
+
+@app.post("/rag", response_model=RAGResponse, tags=["Generation"])
+async def rag(request: RAGRequest) -> Dict[str, Any]:
+    """
+    Answers a question using retrieval-augmented generation.
+
+    The chain is awaited end to end (async retrieval, async LLM call), so
+    slow LLM round-trips never block the event loop.
+
+    Args:
+        request (RAGRequest): The user's question.
+
+    Returns:
+        Dict[str, Any]: The generated answer.
+
+    Raises:
+        HTTPException: 503 if the DB is missing, 500 if generation fails.
+    """
+    try:
+        # A cold process loads the embedding model and opens the store here, so keep it off the loop
+        loop = asyncio.get_running_loop()
+        retriever = await loop.run_in_executor(SEARCH_EXECUTOR, lambda: get_db().as_retriever())
+
+        answer = await get_rag().ainvoke(retriever, request.question)
+        return {"answer": answer}
+
+    except FileNotFoundError as e:
+        logger.error(f"RAG failed: {e}")
+        raise HTTPException(status_code=503, detail="Search database not initialized. Run ingestion.")
+    except Exception as e:
+        logger.error(f"Critical RAG error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Generation Error")
@@ -5,12 +5,14 @@ It ensures type safety and provides default values for critical settings.
 """
 
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class VectorDBType(str, Enum):
     """Supported Vector Database providers."""
     CHROMA = "chroma"
+    FAISS = "faiss"
 
 class LLMProvider(str, Enum):
     """Supported Large Language Model providers (for generation)."""
@@ -39,6 +41,22 @@ class Settings(BaseSettings):
     chunk_size: int = 1000
     chunk_overlap: int = 200
     log_level: str = "INFO"
+    # Storage precision of FAISS index vectors (Chroma is float32 only): int8 moves 4x fewer bytes per scan than fp32
+    embedding_dtype: Literal["fp32", "fp16", "int8"] = "fp32"
+    # FAISS index structure: exact flat scan, an HNSW graph, or IVF-PQ (sub-linear and compressed)
+    faiss_index_type: Literal["flat", "hnsw", "ivfpq"] = "flat"
+    # HNSW graph parameters, used by Chroma collections and FAISS "hnsw" indexes
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    # FAISS IVF-PQ: coarse clusters, clusters probed per query, and one-byte sub-quantizers per vector
+    ivf_nlist: int = 4096
+    ivf_nprobe: int = 8
+    pq_m: int = 64
+    # Re-rank k x this many quantized (fp16/int8) FAISS candidates with exact float32 vectors; 0 disables
+    faiss_rerank_factor: int = 0
+    # Memory-map the saved FAISS index read-only instead of loading it into each process's heap
+    faiss_mmap: bool = True
 
     # --- API Keys ---
     openai_api_key: Optional[str] = None
@@ -53,9 +71,62 @@ class Settings(BaseSettings):
     openai_embedding_model: str = "text-embedding-3-small"
     google_embedding_model: str = "models/embedding-001"
     huggingface_embedding_model: str = "all-MiniLM-L6-v2"
+    # Inference runtime for the local model: PyTorch, ONNX Runtime, or ONNX Runtime with int8 weights
+    embedding_runtime: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    # Texts per forward pass of the local model (the "torch" runtime runs on CUDA in float16 when available)
+    huggingface_batch_size: int = 64
+
+    # --- Ingestion ---
+    # Processes used to parse raw files (None: all cores but one)
+    load_documents_num_workers: Optional[int] = None
+    # Large PDFs are parsed in page ranges of this size, spread over the loader processes
+    pdf_pages_per_task: int = 16
+    # In-process loading reads up to this many PDFs ahead on a background thread while parsing
+    pdf_prefetch_depth: int = 4
+    # Chunks are embedded in batches of this size, several batches in flight for remote providers
+    embedding_batch_size: int = 256
+    embedding_max_workers: int = 8
+    # Chunks written to the vector store per add call, and the p99 batch latency that triggers a warning
+    ingest_batch_size: int = 1024
+    ingest_batch_latency_slo_s: float = 30.0
+
+    # --- Caching ---
+    # Query embeddings are cached in memory (LRU), and on disk if a dir is set (one file per query, LRU-capped)
+    query_embedding_cache_size: int = 4096
+    query_embedding_cache_dir: Optional[str] = None
+    query_embedding_cache_max_files: int = 100_000
+    # Chunk lists per document (one file each), so re-ingestion only splits changed documents (None disables)
+    split_cache_dir: Optional[str] = "data/cache/chunks"
+    # Document embeddings per (model, text) in SQLite, so re-ingestion only embeds new text (None disables)
+    document_embedding_cache_path: Optional[str] = "data/cache/document_embeddings.sqlite"
+
+    # --- API Serving ---
+    # Worker threads for blocking retrieval calls (query embedding + ANN search)
+    search_max_workers: int = 4
+    # Concurrent /search queries are coalesced into one batched search call
+    search_max_batch: int = 32
+    search_max_wait_ms: float = 5.0
+    # Searches in flight at once; excess requests wait on the event loop instead of allocating buffers
+    max_concurrent_searches: int = 64
+    # Encoded /search responses kept per (query, k) until the next ingestion; 0 disables the cache
+    search_result_cache_size: int = 1024
+    # Opt-in: recent query vectors whose results serve near-duplicate queries (cosine >= threshold); 0 disables
+    semantic_cache_size: int = 0
+    semantic_cache_threshold: float = 0.97
 
     # --- Pydantic Config ---
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+    # Frozen: settings are read-only after startup and hashable
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore", frozen=True)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Returns the process-wide settings, reading `.env` and validating only once.
+
+    Returns:
+        Settings: The cached application settings.
+    """
+    return Settings()
 
 # Singleton instance for import across the app
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
@@ -1,3 +1,3 @@
-from .llm import RAGGenerator
+from .llm import RAGGenerator, get_rag
 
-__all__ = ["RAGGenerator"]
\ No newline at end of file
+__all__ = ["RAGGenerator", "get_rag"]
\ No newline at end of file
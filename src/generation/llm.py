@@ -7,8 +7,9 @@ It is designed to be agnostic to the underlying Vector Database implementation,
 relying solely on the standard LangChain `VectorStoreRetriever` interface.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from functools import lru_cache
+from typing import List
+from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnableSerializable
@@ -19,6 +20,21 @@ from src.utils import setup_logger
 
 logger = setup_logger(__name__)
 
+def format_docs(docs: List[Document]) -> str:
+    """
+    Joins document content into a single context string.
+
+    `str.join` sizes its output in one pass over a list, whereas a generator
+    argument is first copied into a temporary sequence.
+
+    Args:
+        docs (List[Document]): The retrieved documents.
+
+    Returns:
+        str: The page contents separated by blank lines.
+    """
+    return "\n\n".join([doc.page_content for doc in docs])
+
 class RAGGenerator:
     """
     Orchestrates the LLM generation process.
@@ -26,11 +42,16 @@ class RAGGenerator:
     Attributes:
         llm: The configured LLM instance (OpenAI or Google).
         prompt (ChatPromptTemplate): The prompt template for Q&A.
+        _chain (Optional[RunnableSerializable]): The last chain built by `get_chain`.
+        _chain_retriever (Optional[VectorStoreRetriever]): The retriever `_chain` was built for.
     """
 
     def __init__(self):
         """Initializes the RAGGenerator with model settings."""
+        self._chain = None
+        self._chain_retriever = None
         self.llm = self._get_llm_model()
+        self._parser = StrOutputParser()
         self.prompt = ChatPromptTemplate.from_template("""
             Answer the question based only on the following context:
             {context}
@@ -41,11 +62,16 @@ class RAGGenerator:
     def _get_llm_model(self):
         """
         Selects and initializes the LLM based on global configuration.
+
+        Provider packages are imported here, so only the selected one (and its
+        tokenizer / gRPC stack) is loaded at startup.
         
         Returns:
             ChatOpenAI | ChatGoogleGenerativeAI: The initialized LLM object.
         """
-        if settings.llm_provider == LLMProvider.GOOGLE:
+        if settings.llm_provider is LLMProvider.GOOGLE:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
             logger.info(f"Initializing Google Gemini Model: {settings.google_model_name}")
             return ChatGoogleGenerativeAI(
                 model=settings.google_model_name,
@@ -53,6 +79,8 @@ class RAGGenerator:
                 google_api_key=settings.google_api_key
             )
         else: # LLMProvider.OPENAI
+            from langchain_openai import ChatOpenAI
+
             logger.info(f"Initializing OpenAI Model: {settings.openai_model_name}")
             return ChatOpenAI(
                 model=settings.openai_model_name,
@@ -64,6 +92,9 @@ class RAGGenerator:
         """
         Constructs the standard LCEL (LangChain Expression Language) chain.
 
+        The chain is built once per retriever and reused on later calls, so a
+        long-running process does not re-compose the pipeline per question.
+
         The chain performs the following steps:
         1. Retrieves relevant documents using the passed `retriever`.
         2. Formats the documents into a single string.
@@ -78,9 +109,8 @@ class RAGGenerator:
         Returns:
             RunnableSerializable: A compiled LangChain runnable ready for invocation.
         """
-        def format_docs(docs):
-            """Helper to join document content into a single string."""
-            return "\n\n".join(doc.page_content for doc in docs)
+        if self._chain is not None and retriever is self._chain_retriever:
+            return self._chain
 
         chain = (
             {
@@ -89,6 +119,41 @@ class RAGGenerator:
             }
             | self.prompt
             | self.llm
-            | StrOutputParser()
+            | self._parser
         )
-        return chain
\ No newline at end of file
+        self._chain, self._chain_retriever = chain, retriever
+        return chain
+
+    async def ainvoke(self, retriever: VectorStoreRetriever, question: str) -> str:
+        """
+        Answers a question asynchronously with the steps of the RAG chain.
+
+        Retrieval and the LLM call are awaited rather than blocking, so an
+        async server keeps its event loop free while the answer is generated.
+        The steps of `get_chain` are called directly, since the pipeline is
+        fixed: this skips the LCEL graph walk (parallel map, passthrough and
+        per-step config handling) on every request.
+
+        Args:
+            retriever (VectorStoreRetriever): The retriever providing context.
+            question (str): The user's question.
+
+        Returns:
+            str: The generated answer.
+        """
+        docs = await retriever.ainvoke(question)
+        messages = self.prompt.format_messages(context=format_docs(docs), question=question)
+        return self._parser.invoke(await self.llm.ainvoke(messages))
+
+@lru_cache(maxsize=1)
+def get_rag() -> RAGGenerator:
+    """
+    Returns the process-wide RAGGenerator.
+
+    Constructing the generator creates the LLM network client, so it is done
+    once per process rather than per query.
+
+    Returns:
+        RAGGenerator: The shared generator instance.
+    """
+    return RAGGenerator()
\ No newline at end of file
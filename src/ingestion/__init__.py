@@ -1,5 +1,6 @@
-from .loader import load_documents
-from .splitter import split_documents
+from .loader import iter_documents, load_documents
+from .splitter import iter_split_documents, split_documents
 from .base import BaseIngestion
+from .chunks import Chunks
 
-__all__ = ["load_documents", "split_documents", "BaseIngestion"]
\ No newline at end of file
+__all__ = ["iter_documents", "load_documents", "iter_split_documents", "split_documents", "BaseIngestion", "Chunks"]
\ No newline at end of file
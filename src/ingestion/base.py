@@ -6,7 +6,7 @@ depend on abstractions rather than concrete details.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Any
+from typing import Any, Iterable, Iterator, List, Optional
 from langchain_core.documents import Document
 
 class BaseIngestion(ABC):
@@ -33,15 +33,35 @@ class BaseIngestion(ABC):
         pass
 
     @abstractmethod
-    def chunk(self, documents: List[Document], chunk_size: int = 1000) -> List[Document]:
+    def chunk(self, documents: Iterable[Document], chunk_size: int = 1000) -> List[Document]:
         """
         Splits raw documents into smaller semantic units suitable for embedding.
         
         Args:
-            documents (List[Document]): The raw documents to split.
+            documents (Iterable[Document]): The raw documents to split; may be a
+                                            lazy iterator (e.g. pages as they are read).
             chunk_size (int): Target size for each chunk.
 
         Returns:
             List[Document]: List of chunked documents.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def load_and_chunk(self, source: str, chunk_size: Optional[int] = None, **kwargs: Any) -> Iterator[Document]:
+        """
+        Loads raw data and splits it in a single streaming pass.
+
+        Equivalent to `chunk(load(source))`, but each loaded batch is split as
+        soon as it is read, so the full set of raw documents is never held
+        in memory at once.
+
+        Args:
+            source (str): The origin of the data (see `load`).
+            chunk_size (int, optional): Target size for each chunk.
+            **kwargs: Additional arguments specific to the concrete implementation.
+
+        Returns:
+            Iterator[Document]: The chunked documents, in source order.
+        """
+        pass
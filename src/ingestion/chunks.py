@@ -0,0 +1,94 @@
+"""Columnar container for processed chunks.
+
+Vector stores consume chunks as parallel columns (texts for the embedder,
+metadatas and IDs for the collection), so converting the splitter's
+`List[Document]` once here spares every ingestion batch its own pass of
+per-Document attribute lookups.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+from langchain_core.documents import Document
+
+def chunk_id(text: str, metadata: Dict[str, Any]) -> str:
+    """
+    Derives a deterministic ID from a chunk's content and metadata.
+
+    Re-ingesting an unchanged chunk therefore yields the same ID, which lets
+    a store skip it instead of embedding it again. Metadata is part of the
+    key so identical text at two positions (pages, rows) stays two records.
+
+    Args:
+        text (str): The chunk text.
+        metadata (Dict[str, Any]): The chunk metadata.
+
+    Returns:
+        str: A 32-character hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(text.encode("utf-8"))
+    digest.update(repr(sorted(metadata.items())).encode("utf-8"))
+    return digest.hexdigest()
+
+@dataclass
+class Chunks:
+    """
+    Processed chunks stored as parallel columns (structure of arrays).
+
+    Attributes:
+        texts (List[str]): The chunk texts, in order.
+        metadatas (List[Dict[str, Any]]): The metadata of each chunk.
+        ids (List[str]): The content-derived ID of each chunk (see `chunk_id`).
+    """
+
+    texts: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_documents(cls, documents: List[Document]) -> "Chunks":
+        """
+        Splits documents into columns in a single pass.
+
+        Args:
+            documents (List[Document]): The chunked documents.
+
+        Returns:
+            Chunks: The same chunks, column by column.
+        """
+        texts = [document.page_content for document in documents]
+        metadatas = [document.metadata for document in documents]
+        return cls(texts, metadatas, list(map(chunk_id, texts, metadatas)))
+
+    def __len__(self) -> int:
+        """Returns the number of chunks."""
+        return len(self.texts)
+
+    def take(self, indices: List[int]) -> "Chunks":
+        """
+        Selects chunks by position.
+
+        Args:
+            indices (List[int]): Positions of the chunks to keep, in output order.
+
+        Returns:
+            Chunks: A new container with only the selected chunks.
+        """
+        return Chunks(
+            [self.texts[i] for i in indices],
+            [self.metadatas[i] for i in indices],
+            [self.ids[i] for i in indices]
+        )
+
+    def as_documents(self) -> List[Document]:
+        """
+        Converts the columns back to LangChain documents.
+
+        Returns:
+            List[Document]: One Document per chunk, with its ID set.
+        """
+        return [
+            Document(page_content=text, metadata=metadata, id=doc_id)
+            for text, metadata, doc_id in zip(self.texts, self.metadatas, self.ids)
+        ]
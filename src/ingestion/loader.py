@@ -4,26 +4,282 @@ This module handles the loading of raw data files from the disk.
 It supports multiple file formats (PDF, CSV) to satisfy assignment requirements.
 """
 
+import csv
 import os
-import glob
-from typing import List
-from langchain_community.document_loaders import PyPDFLoader, CSVLoader
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Deque, Iterator, List, Optional, Tuple
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pypdfium2 as pdfium
 from langchain_core.documents import Document
+from src.config import settings
 from src.utils import setup_logger
 
 # Initialize logger for this module
 logger = setup_logger(__name__)
 
-def load_documents(directory: str) -> List[Document]:
+def _read_file(file_path: str) -> bytes:
     """
-    Loads all supported documents (PDF and CSV) from a directory.
+    Reads a whole file with a single sized read.
+
+    PDF parsers seek around the file in many small reads (xref table, object
+    streams, per-page content); parsing from one in-memory buffer replaces
+    those syscalls with one sequential read.
 
     Args:
-        directory (str): Path to the directory containing raw files.
+        file_path (str): The file to read.
 
     Returns:
-        List[Document]: A combined list of loaded documents.
-    
+        bytes: The file contents.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        return f.readall()
+
+def _load_pdf(file_path: str, pages: Optional[range] = None, data: Optional[bytes] = None) -> List[Document]:
+    """
+    Extracts text from a PDF, one Document per page.
+
+    Uses PDFium (native C++) rather than a pure-Python parser, so content
+    streams and fonts are decoded outside the interpreter.
+
+    Without prefetched bytes the file is opened by path, so PDFium reads only
+    the objects of the requested pages; pool workers each parse one page
+    range, and reading the whole file per range would multiply the I/O.
+
+    Args:
+        file_path (str): Path to the PDF.
+        pages (Optional[range]): Zero-based page indices to extract; None for all pages.
+        data (Optional[bytes]): The file contents if already read (see `_prefetch_pdfs`); None to open by path.
+
+    Returns:
+        List[Document]: One Document per page, with `source` and `page` metadata.
+    """
+    pdf = pdfium.PdfDocument(file_path if data is None else data)
+    try:
+        if pages is None:
+            pages = range(len(pdf))
+        documents = []
+        for i in pages:
+            text = pdf[i].get_textpage().get_text_range()
+            # PDFium ends lines with CRLF; the splitter's separators expect "\n"
+            documents.append(Document(page_content=text.replace("\r\n", "\n"), metadata={"source": file_path, "page": i}))
+        return documents
+    finally:
+        pdf.close()
+
+def _load_csv(file_path: str, source_column: str = "Job Title") -> List[Document]:
+    """
+    Loads a CSV file, one Document per row.
+
+    The file is parsed by Arrow's multithreaded C++ reader into string
+    columns, so only the final Documents are built in Python. Output matches
+    LangChain's `CSVLoader`: `"<column>: <value>"` lines (both stripped) as
+    content, and the source column and row number as metadata.
+
+    Args:
+        file_path (str): Path to the CSV (UTF-8).
+        source_column (str): The column copied into each row's `source` metadata.
+
+    Returns:
+        List[Document]: One Document per data row.
+
+    Raises:
+        ValueError: If the source column is missing.
+    """
+    with open(file_path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    if source_column not in header:
+        raise ValueError(f"Source column '{source_column}' not found in CSV file.")
+
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(use_threads=True, encoding="utf-8"),
+        # Job descriptions span several lines inside quotes
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        # Keep every cell as its original text (no numeric or null inference)
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=False
+        )
+    )
+    names = [name.strip() for name in table.column_names]
+    columns = [column.to_pylist() for column in table.columns]
+    sources = table.column(source_column).to_pylist()
+    return [
+        Document(
+            page_content="\n".join(f"{name}: {value.strip()}" for name, value in zip(names, row)),
+            metadata={"source": source, "row": i}
+        )
+        for i, (source, row) in enumerate(zip(sources, zip(*columns)))
+    ]
+
+def _page_ranges(file_path: str) -> List[Optional[range]]:
+    """
+    Splits a PDF into page ranges of `settings.pdf_pages_per_task` pages.
+
+    Args:
+        file_path (str): Path to the PDF.
+
+    Returns:
+        List[Optional[range]]: The page ranges in order, or `[None]` (the
+        whole file in one task) if the PDF cannot be opened here.
+    """
+    try:
+        pdf = pdfium.PdfDocument(file_path)
+        num_pages = len(pdf)
+        pdf.close()
+    except Exception:
+        # `_load_one` reports the error when the task runs
+        return [None]
+    step = settings.pdf_pages_per_task
+    return [range(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+
+def _load_one(file_path: str, pages: Optional[range] = None, data: Optional[bytes] = None) -> List[Document]:
+    """
+    Loads a single CSV file, or a range of pages from a PDF.
+
+    Defined at module level (and building its loaders here) so it can be
+    sent to worker processes by name.
+
+    Args:
+        file_path (str): Path to a `.pdf` or `.csv` file.
+        pages (Optional[range]): For PDFs, the pages to extract; None for all pages.
+        data (Optional[bytes]): For PDFs, the prefetched file contents, if any.
+
+    Returns:
+        List[Document]: The loaded documents, or an empty list if loading failed.
+    """
+    if file_path.endswith(".pdf"):
+        try:
+            # Per-task lines are debug-only and formatted lazily; `iter_documents` logs a summary
+            logger.debug("Loading PDF: %s (pages %s)", file_path, pages or "all")
+            return _load_pdf(file_path, pages, data)
+        except Exception as e:
+            logger.error(f"Failed to load PDF {file_path}: {e}")
+            return []
+
+    try:
+        logger.debug("Loading CSV: %s", file_path)
+        # FIX: explicit encoding handles Windows issues with special chars
+        return _load_csv(file_path, source_column="Job Title")
+    except Exception as e:
+        logger.error(f"Failed to load CSV {file_path}: {e}")
+        return []
+
+def _read_pdf_or_none(file_path: str) -> Optional[bytes]:
+    """Reads a PDF for prefetching; on failure `_load_one` re-reads it and reports the error."""
+    try:
+        return _read_file(file_path)
+    except OSError:
+        return None
+
+def _prefetch_pdfs(paths: List[str], depth: int) -> Iterator[Optional[bytes]]:
+    """
+    Yields each task's PDF bytes, reading up to `depth` files ahead on a background thread.
+
+    File reads release the GIL, so the next PDFs come off disk while the
+    current one is parsed. Consecutive tasks on the same PDF (its page
+    ranges) share one read.
+
+    Args:
+        paths (List[str]): The task paths, in processing order.
+        depth (int): Number of reads kept in flight ahead of the consumer.
+
+    Yields:
+        Optional[bytes]: The file contents for PDF tasks, None for other files.
+    """
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-prefetch") as io:
+        last_path, last_read = None, None
+
+        def submit(path: str) -> Optional[Future]:
+            nonlocal last_path, last_read
+            if path != last_path:
+                last_path = path
+                last_read = io.submit(_read_pdf_or_none, path) if path.endswith(".pdf") else None
+            return last_read
+
+        upcoming = iter(paths)
+        queue: Deque[Optional[Future]] = deque(map(submit, islice(upcoming, max(1, depth))))
+        while queue:
+            read = queue.popleft()
+            queue.extend(map(submit, islice(upcoming, 1)))
+            yield None if read is None else read.result()
+
+def _intern_metadata(documents: List[Document]) -> List[Document]:
+    """
+    Interns the string keys and values of each document's metadata in place.
+
+    Every page of a PDF repeats its path, and many CSV rows share a job
+    title; documents returned by worker processes also arrive with their own
+    unpickled copy of each string. Interning collapses those copies into one
+    shared object per distinct string, which the splitter's per-chunk
+    metadata copies then reference instead of duplicating.
+
+    Args:
+        documents (List[Document]): Freshly loaded documents.
+
+    Returns:
+        List[Document]: The same documents.
+    """
+    for document in documents:
+        document.metadata = {
+            sys.intern(key): sys.intern(value) if type(value) is str else value
+            for key, value in document.metadata.items()
+        }
+    return documents
+
+def _list_files(directory: str) -> Tuple[List[str], List[str]]:
+    """
+    Lists the PDF and CSV files directly inside a directory.
+
+    One `os.scandir` pass reads names and file types together (no per-entry
+    `stat` on most filesystems), instead of one glob per extension.
+
+    Args:
+        directory (str): The directory to scan (not recursive).
+
+    Returns:
+        Tuple[List[str], List[str]]: The PDF paths and the CSV paths, in directory order.
+    """
+    pdf_files, csv_files = [], []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if entry.name.endswith(".pdf"):
+                pdf_files.append(entry.path)
+            elif entry.name.endswith(".csv"):
+                csv_files.append(entry.path)
+    return pdf_files, csv_files
+
+def _num_workers(num_tasks: int) -> int:
+    """Returns the loader process count: the configured value, else all cores but one."""
+    workers = settings.load_documents_num_workers or max(1, (os.cpu_count() or 1) - 1)
+    return max(1, min(workers, num_tasks))
+
+def iter_documents(directory: str) -> Iterator[List[Document]]:
+    """
+    Loads all supported documents (PDF and CSV) from a directory, task by task.
+
+    Parsing is CPU-bound and independent per file and per PDF page, so PDFs
+    are split into page ranges and those ranges, along with the CSVs, are
+    spread over a process pool (`settings.load_documents_num_workers`).
+    Workers read their own files, so I/O overlaps with other workers'
+    parsing; a single in-process loader prefetches upcoming PDFs on a
+    background thread instead (see `_prefetch_pdfs`). Each task's documents are yielded as soon as they are ready, in the
+    sequential order: PDF pages first, then CSVs, each in directory order.
+    Consumers can process one batch before the next is held in memory.
+
+    Args:
+        directory (str): Path to the directory containing raw files.
+
+    Yields:
+        List[Document]: The documents of one file or PDF page range.
+
     Raises:
         FileNotFoundError: If the directory does not exist.
     """
@@ -31,36 +287,46 @@ def load_documents(directory: str) -> List[Document]:
         logger.error(f"Directory not found: {directory}")
         raise FileNotFoundError(f"Directory not found: {directory}")
 
-    documents = []
-    
-    # 1. Load PDFs
-    pdf_files = glob.glob(os.path.join(directory, "*.pdf"))
-    for file_path in pdf_files:
-        try:
-            logger.info(f"Loading PDF: {file_path}")
-            loader = PyPDFLoader(file_path)
-            documents.extend(loader.load())
-        except Exception as e:
-            logger.error(f"Failed to load PDF {file_path}: {e}")
+    # 1. PDFs, then 2. CSVs
+    pdf_files, csv_files = _list_files(directory)
+    tasks = [(path, pages) for path in pdf_files for pages in _page_ranges(path)]
+    tasks += [(path, None) for path in csv_files]
+    paths = [path for path, _ in tasks]
+    page_ranges = [pages for _, pages in tasks]
 
-    # 2. Load CSVs (FIX: Added encoding='utf-8')
-    csv_files = glob.glob(os.path.join(directory, "*.csv"))
-    for file_path in csv_files:
-        try:
-            logger.info(f"Loading CSV: {file_path}")
-            # FIX: explicit encoding handles Windows issues with special chars
-            loader = CSVLoader(
-                file_path=file_path, 
-                source_column="Job Title", 
-                encoding="utf-8"
-            )
-            documents.extend(loader.load())
-        except Exception as e:
-            logger.error(f"Failed to load CSV {file_path}: {e}")
+    started = time.perf_counter()
+    workers = _num_workers(len(tasks))
+    if workers == 1:
+        prefetched = _prefetch_pdfs(paths, settings.pdf_prefetch_depth)
+        yield from map(_intern_metadata, map(_load_one, paths, page_ranges, prefetched))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from map(_intern_metadata, pool.map(_load_one, paths, page_ranges))
+    logger.info(
+        "Loaded %d PDFs (%d tasks) and %d CSVs with %d workers in %.2fs.",
+        len(pdf_files), len(tasks) - len(csv_files), len(csv_files), workers, time.perf_counter() - started
+    )
+
+def load_documents(directory: str) -> List[Document]:
+    """
+    Loads all supported documents (PDF and CSV) from a directory.
+
+    Collects every batch from `iter_documents` into one list.
+
+    Args:
+        directory (str): Path to the directory containing raw files.
+
+    Returns:
+        List[Document]: A combined list of loaded documents.
+    
+    Raises:
+        FileNotFoundError: If the directory does not exist.
+    """
+    documents = list(chain.from_iterable(iter_documents(directory)))
 
     if not documents:
         logger.warning(f"No PDF or CSV documents found in {directory}")
     else:
         logger.info(f"Successfully loaded {len(documents)} total documents.")
         
-    return documents
\ No newline at end of file
+    return documents
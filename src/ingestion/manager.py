@@ -5,11 +5,11 @@ It implements the `BaseIngestion` interface but delegates the actual heavy lifti
 to specialized functional modules (`loader.py` and `splitter.py`).
 """
 
-from typing import List, Optional, Any
+from typing import Any, Iterable, Iterator, List, Optional
 from langchain_core.documents import Document
 from src.ingestion.base import BaseIngestion
-from src.ingestion.loader import load_documents
-from src.ingestion.splitter import split_documents
+from src.ingestion.loader import iter_documents, load_documents
+from src.ingestion.splitter import iter_split_documents, split_documents
 from src.utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -43,18 +43,39 @@ class IngestionManager(BaseIngestion):
         # scans for all supported formats (CSV & PDF)
         return load_documents(source)
 
-    def chunk(self, documents: List[Document], chunk_size: Optional[int] = None) -> List[Document]:
+    def chunk(self, documents: Iterable[Document], chunk_size: Optional[int] = None) -> List[Document]:
         """
         Splits documents into semantic chunks.
 
         Delegates to the functional splitter module.
 
         Args:
-            documents (List[Document]): The raw documents to be split.
+            documents (Iterable[Document]): The raw documents to be split. An
+                                            iterator is consumed one document at a time.
             chunk_size (int, optional): The target size for each text chunk. 
                                         If not provided, uses the global setting.
 
         Returns:
             List[Document]: A list of chunked Document objects.
         """
-        return split_documents(documents, chunk_size=chunk_size)
\ No newline at end of file
+        return split_documents(documents, chunk_size=chunk_size)
+
+    def load_and_chunk(self, source: str, chunk_size: Optional[int] = None, **kwargs: Any) -> Iterator[Document]:
+        """
+        Loads and splits documents from the file system in one streaming pass.
+
+        Each file (or PDF page range) yielded by `loader.iter_documents` is
+        split immediately by `splitter.iter_split_documents`, so its raw
+        page texts can be freed before the next file is processed.
+
+        Args:
+            source (str): The directory path to load from.
+            chunk_size (int, optional): The target size for each text chunk. 
+                                        If not provided, uses the global setting.
+            **kwargs: Reserved for future extensibility.
+
+        Returns:
+            Iterator[Document]: The chunked documents, in loading order.
+        """
+        logger.info(f"Manager streaming load and chunk for source: {source}")
+        return iter_split_documents(iter_documents(source), chunk_size=chunk_size)
@@ -4,7 +4,13 @@ This module contains pure functions for breaking down large documents
 into smaller, semantically meaningful chunks suitable for vector embedding.
 """
 
-from typing import List, Optional
+import hashlib
+import os
+import pickle
+import shutil
+from collections import deque
+from typing import Deque, Iterable, Iterator, List, Literal, Optional, Set, Tuple, Union
+import langchain_core
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from src.config import settings
@@ -12,34 +18,308 @@ from src.utils import setup_logger
 
 logger = setup_logger(__name__)
 
-def split_documents(documents: List[Document], chunk_size: Optional[int] = None) -> List[Document]:
+# Bump when the cached entry layout changes, so old entries are not read back
+SPLIT_CACHE_FORMAT = 1
+
+def _split_on_literal(text: str, separator: str, keep_separator: Union[bool, Literal["start", "end"]]) -> List[str]:
     """
-    Splits documents into smaller chunks for vector embedding.
+    Splits text on a literal separator with `str.split`.
 
-    It uses a recursive character splitter to maintain semantic context 
-    by keeping paragraphs and sentences together where possible.
+    Produces the same pieces as LangChain's `_split_text_with_regex` for an
+    escaped literal, without compiling a pattern or building the interleaved
+    capture-group list.
+
+    Args:
+        text (str): The text to split.
+        separator (str): A literal separator ("" splits into characters).
+        keep_separator: Whether (and on which side) pieces keep their separator.
+
+    Returns:
+        List[str]: The non-empty pieces, in order.
+    """
+    if not separator:
+        return list(text)
+    parts = text.split(separator)
+    if keep_separator == "end":
+        splits = [part + separator for part in parts[:-1]] + parts[-1:]
+    elif keep_separator:
+        splits = parts[:1] + [separator + part for part in parts[1:]]
+    else:
+        splits = parts
+    return [piece for piece in splits if piece]
+
+class FastRecursiveCharacterTextSplitter(RecursiveCharacterTextSplitter):
+    """
+    RecursiveCharacterTextSplitter specialized for literal separators.
+
+    The stock splitter runs `re.search` / `re.split` with escaped separators
+    at every recursion level. For literal separators (the default list) this
+    class uses `in` and `str.split`, which scan with CPython's optimized
+    substring search, and produces identical chunks. Regex separators fall
+    back to the stock implementation.
+
+    Merging pieces into chunks is also done as a single sliding window (see
+    `_merge_splits`), avoiding the stock merge's quadratic list copies.
+    """
+
+    def _merge_splits(self, splits: Iterable[str], separator: str) -> List[str]:
+        """
+        Merges pieces into overlapping chunks with a sliding window.
+
+        Same output as the parent method, but the window is a deque of
+        `(piece, length)` pairs: dropping the oldest piece is O(1) instead of
+        copying the remaining list (`current_doc[1:]`), and each piece's
+        length is computed once.
+
+        Args:
+            splits (Iterable[str]): Pieces small enough to be merged.
+            separator (str): Joiner placed between pieces in a chunk.
+
+        Returns:
+            List[str]: The merged chunks.
+        """
+        separator_len = self._length_function(separator)
+
+        docs = []
+        window: Deque[Tuple[str, int]] = deque()
+        total = 0
+        for piece in splits:
+            piece_len = self._length_function(piece)
+            if total + piece_len + (separator_len if window else 0) > self._chunk_size:
+                if total > self._chunk_size:
+                    logger.warning("Created a chunk of size %d, which is longer than the specified %d", total, self._chunk_size)
+                if window:
+                    doc = self._join_docs([text for text, _ in window], separator)
+                    if doc is not None:
+                        docs.append(doc)
+                    # Shrink the window to the overlap, and until the next piece fits
+                    while total > self._chunk_overlap or (
+                        total + piece_len + (separator_len if window else 0) > self._chunk_size
+                        and total > 0
+                    ):
+                        _, oldest_len = window.popleft()
+                        total -= oldest_len + (separator_len if window else 0)
+            window.append((piece, piece_len))
+            total += piece_len + (separator_len if len(window) > 1 else 0)
+        doc = self._join_docs([text for text, _ in window], separator)
+        if doc is not None:
+            docs.append(doc)
+        return docs
+
+    def _split_text(self, text: str, separators: List[str]) -> List[str]:
+        """
+        Splits text recursively, mirroring the parent algorithm.
+
+        Text shorter than `chunk_size` (most CSV rows, sparse PDF pages) would
+        be split on a separator and merged straight back into one chunk; with
+        `len` lengths and kept separators that chunk is the text itself, so
+        it is returned without splitting.
+        """
+        if self._is_separator_regex:
+            return super()._split_text(text, separators)
+
+        if self._keep_separator and self._length_function is len and len(text) < self._chunk_size:
+            doc = self._join_docs([text], "")
+            return [] if doc is None else [doc]
+
+        # Pick the first separator present in the text
+        separator = separators[-1]
+        new_separators = []
+        for i, candidate in enumerate(separators):
+            if not candidate:
+                separator = candidate
+                break
+            if candidate in text:
+                separator = candidate
+                new_separators = separators[i + 1:]
+                break
+
+        splits = _split_on_literal(text, separator, self._keep_separator)
+
+        # Merge small pieces; recurse into pieces that are still too long
+        final_chunks = []
+        good_splits = []
+        merge_separator = "" if self._keep_separator else separator
+        for piece in splits:
+            if self._length_function(piece) < self._chunk_size:
+                good_splits.append(piece)
+                continue
+            if good_splits:
+                final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+                good_splits = []
+            if not new_separators:
+                final_chunks.append(piece)
+            else:
+                final_chunks.extend(self._split_text(piece, new_separators))
+        if good_splits:
+            final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+        return final_chunks
+
+def _cache_key(document: Document, chunk_size: int) -> str:
+    """
+    Content-addresses a document's chunks.
+
+    The key covers everything the chunks depend on: splitter parameters,
+    metadata (copied onto each chunk) and the text itself.
+
+    Args:
+        document (Document): A raw loaded document.
+        chunk_size (int): The effective chunk size.
+
+    Returns:
+        str: A hex digest identifying the document's chunk list.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{chunk_size}:{settings.chunk_overlap}\n".encode("utf-8"))
+    digest.update(repr(sorted(document.metadata.items())).encode("utf-8"))
+    digest.update(document.page_content.encode("utf-8"))
+    return digest.hexdigest()
+
+def _split_cache_version_dir(cache_dir: str, chunk_size: int) -> str:
+    """
+    Returns the cache subdirectory for the current splitter parameters and library version.
+
+    Pickled Documents are tied to the `langchain_core` release that wrote
+    them, so entries from another version (or other splitter parameters)
+    land in a different directory and are never unpickled.
 
     Args:
-        documents (List[Document]): The raw documents loaded from disk.
+        cache_dir (str): The split cache root (`settings.split_cache_dir`).
+        chunk_size (int): The effective chunk size.
+
+    Returns:
+        str: The directory holding this configuration's entries.
+    """
+    version = f"v{SPLIT_CACHE_FORMAT}-langchain-{langchain_core.__version__}-{chunk_size}-{settings.chunk_overlap}"
+    return os.path.join(cache_dir, version)
+
+def _load_split_entry(path: str) -> Optional[List[Document]]:
+    """Reads one document's cached chunks; None if missing or unreadable (the document is re-split)."""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Truncated files, or classes pickled by another library version
+        logger.warning(f"Ignoring unreadable split cache entry {path}: {e}")
+        return None
+
+def _save_split_entry(path: str, chunks: List[Document]) -> None:
+    """Writes one document's chunks atomically; failures only cost the next run a re-split."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(chunks, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write split cache entry {path}: {e}")
+
+def _prune_split_cache(cache_dir: str, version_dir: str, keys: Set[str]) -> None:
+    """
+    Deletes entries for documents no longer in the corpus, and other versions' directories.
+
+    Args:
+        cache_dir (str): The split cache root.
+        version_dir (str): The directory written by this run.
+        keys (Set[str]): The cache keys of this run's documents.
+    """
+    try:
+        with os.scandir(cache_dir) as entries:
+            stale_dirs = [entry.path for entry in entries if entry.path != version_dir]
+        with os.scandir(version_dir) as entries:
+            stale_files = [entry.path for entry in entries if entry.name[:-len(".pkl")] not in keys]
+    except OSError:
+        return
+    for path in stale_dirs:
+        shutil.rmtree(path, ignore_errors=True)
+    for path in stale_files:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def iter_split_documents(batches: Iterable[List[Document]], chunk_size: Optional[int] = None) -> Iterator[Document]:
+    """
+    Splits batches of documents into chunks, yielding each batch's chunks in turn.
+
+    Raw documents are only needed until their chunks are produced, so a
+    streaming source (e.g. `loader.iter_documents`) never has to hold the
+    whole corpus of page texts alongside the chunks.
+
+    Chunk lists are cached on disk one file per document
+    (`settings.split_cache_dir`), keyed by content and splitter parameters,
+    so re-ingesting a mostly unchanged corpus only splits the documents that
+    changed. Entries are read and written as each document streams past;
+    only the keys seen so far are kept in memory.
+
+    Args:
+        batches (Iterable[List[Document]]): The raw documents, in batches.
         chunk_size (int, optional): The target size for each chunk. 
                                     If None, defaults to `settings.chunk_size`.
 
-    Returns:
-        List[Document]: A list of smaller, chunked documents.
+    Yields:
+        Document: The chunks, in document order.
     """
     # Prioritize the passed argument, fallback to global settings
     final_chunk_size = chunk_size or settings.chunk_size
     
-    logger.info(f"Splitting {len(documents)} documents with chunk_size={final_chunk_size}...")
+    logger.info(f"Splitting documents with chunk_size={final_chunk_size}...")
 
-    text_splitter = RecursiveCharacterTextSplitter(
+    text_splitter = FastRecursiveCharacterTextSplitter(
         chunk_size=final_chunk_size,
         chunk_overlap=settings.chunk_overlap,
         length_function=len,
         add_start_index=True,
     )
 
-    chunks = text_splitter.split_documents(documents)
-    logger.info(f"Created {len(chunks)} chunks.")
-    
-    return chunks
\ No newline at end of file
+    cache_dir = settings.split_cache_dir
+    version_dir = _split_cache_version_dir(cache_dir, final_chunk_size) if cache_dir else None
+    # Keys of this corpus; entries for documents no longer present are pruned at the end
+    seen: Set[str] = set()
+    num_documents = num_misses = num_chunks = 0
+
+    for documents in batches:
+        for document in documents:
+            key = _cache_key(document, final_chunk_size)
+            path = os.path.join(version_dir, f"{key}.pkl") if version_dir else None
+            chunks = _load_split_entry(path) if path else None
+            if chunks is None:
+                chunks = text_splitter.split_documents([document])
+                num_misses += 1
+                if path and key not in seen:
+                    _save_split_entry(path, chunks)
+            seen.add(key)
+            num_documents += 1
+            num_chunks += len(chunks)
+            yield from chunks
+
+    if num_misses:
+        logger.info(f"Split {num_misses} new or changed documents; {num_documents - num_misses} cached.")
+    # An empty run (e.g. a missing data directory) must not wipe the cache
+    if version_dir and num_documents:
+        _prune_split_cache(cache_dir, version_dir, seen)
+    logger.info(f"Created {num_chunks} chunks from {num_documents} documents.")
+
+def split_documents(documents: Iterable[Document], chunk_size: Optional[int] = None) -> List[Document]:
+    """
+    Splits documents into smaller chunks for vector embedding.
+
+    It uses a recursive character splitter to maintain semantic context 
+    by keeping paragraphs and sentences together where possible. See
+    `iter_split_documents` for the per-document chunk cache.
+
+    Documents are split one at a time as they are drawn from `documents`, so
+    a lazy page iterator never holds more than one raw page alongside the
+    chunks.
+
+    Args:
+        documents (Iterable[Document]): The raw documents loaded from disk.
+        chunk_size (int, optional): The target size for each chunk. 
+                                    If None, defaults to `settings.chunk_size`.
+
+    Returns:
+        List[Document]: A list of smaller, chunked documents.
+    """
+    return list(iter_split_documents([documents], chunk_size))
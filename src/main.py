@@ -14,7 +14,7 @@ import argparse
 import sys
 from src.ingestion.manager import IngestionManager
 from src.retrieval.vector_db import get_vector_db  # <--- UPDATED: Import Factory
-from src.generation.llm import RAGGenerator
+from src.generation.llm import get_rag
 from src.utils import setup_logger
 
 # Initialize logger
@@ -24,7 +24,7 @@ def ingest(data_dir: str) -> None:
     """Executes the data ingestion pipeline.
     
     This function:
-    1. Loads and chunks documents using the IngestionManager.
+    1. Loads and chunks documents in one streaming pass using the IngestionManager.
     2. Persists them using the configured Vector Database.
 
     Args:
@@ -36,14 +36,11 @@ def ingest(data_dir: str) -> None:
     ingestion_manager = IngestionManager()
     
     try:
-        # 2. Load Documents
-        docs = ingestion_manager.load(data_dir)
-        if not docs:
+        # 2-3. Load and chunk documents in one streaming pass
+        chunks = list(ingestion_manager.load_and_chunk(data_dir))
+        if not chunks:
             logger.warning("No documents loaded. Aborting ingestion.")
             return
-
-        # 3. Chunk Documents
-        chunks = ingestion_manager.chunk(docs)
         
         # 4. Persist to Vector DB using Factory
         logger.info(f"Creating vector store with {len(chunks)} chunks...")
@@ -64,7 +61,7 @@ def query(question: str) -> None:
     This function:
     1. Gets the configured Vector DB from the factory.
     2. initializes the Retriever.
-    3. Runs the RAG chain to generate an answer.
+    3. Runs the RAG chain, streaming the answer to stdout as it is generated.
 
     Args:
         question (str): The user's query string.
@@ -84,14 +81,17 @@ def query(question: str) -> None:
         logger.error(f"Unexpected error initializing retriever: {e}")
         return
 
-    # 3. Initialize RAG Generator & Chain
-    rag = RAGGenerator()
+    # 3. Get the shared RAG Generator & Chain
+    rag = get_rag()
     chain = rag.get_chain(retriever)
     
     print("Thinking...")
     try:
-        response = chain.invoke(question)
-        print(f"\nAnswer: {response}")
+        # Stream tokens as they arrive so the answer starts printing immediately
+        print("\nAnswer: ", end="", flush=True)
+        for token in chain.stream(question):
+            print(token, end="", flush=True)
+        print()
     except Exception as e:
         logger.error(f"Error generating response: {e}")
         print("An error occurred while generating the answer.")
@@ -1,4 +1,4 @@
-from .vector_db import ChromaVectorDB, get_vector_db
+from .vector_db import ChromaVectorDB, FaissVectorDB, get_vector_db
 from .base import BaseVectorDB
 
-__all__ = ["ChromaVectorDB", "get_vector_db", "BaseVectorDB"]
\ No newline at end of file
+__all__ = ["ChromaVectorDB", "FaissVectorDB", "get_vector_db", "BaseVectorDB"]
\ No newline at end of file
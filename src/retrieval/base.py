@@ -12,8 +12,9 @@ Key Benefits:
        creating a new class that inherits from this interface.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 from langchain_core.documents import Document
 from langchain_core.vectorstores import VectorStoreRetriever
 
@@ -22,7 +23,8 @@ class BaseVectorDB(ABC):
     Abstract Base Class for Vector Database Management.
     
     All concrete vector store implementations must inherit from this class
-    and implement the `create_vector_store` and `as_retriever` methods.
+    and implement the `create_vector_store`, `as_retriever` and
+    `batch_similarity_search` methods.
     """
 
     @abstractmethod
@@ -42,6 +44,19 @@ class BaseVectorDB(ABC):
         """
         pass
 
+    async def acreate_vector_store(self, chunks: List[Document]) -> None:
+        """
+        Asynchronously ingests document chunks into the vector database.
+
+        The default runs `create_vector_store` in a worker thread, so the
+        caller's event loop stays responsive; implementations with async
+        embedding clients override it to overlap provider round-trips.
+
+        Args:
+            chunks (List[Document]): Pre-chunked LangChain Document objects.
+        """
+        await asyncio.to_thread(self.create_vector_store, chunks)
+
     @abstractmethod
     def as_retriever(self) -> VectorStoreRetriever:
         """
@@ -54,4 +69,23 @@ class BaseVectorDB(ABC):
             VectorStoreRetriever: A LangChain retriever initialized with the 
                                   correct embedding model and search parameters.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def batch_similarity_search(self, queries: List[str], k: int) -> List[List[Tuple[Document, float]]]:
+        """
+        Runs several similarity searches with a single embedding and index call.
+
+        Batching amortizes the per-call embedding round-trip and index probe
+        across concurrent queries, which is how the API layer serves bursts.
+
+        Args:
+            queries (List[str]): The raw query strings.
+            k (int): Number of results to return per query.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: For each query (in input order),
+                                                documents paired with relevance
+                                                scores in [0, 1], best first.
+        """
+        pass
@@ -1 +1,514 @@
-# Embedding model wrapper
\ No newline at end of file
+"""Embedding model wrappers.
+
+This module provides adapters around LangChain `Embeddings` objects and
+caches for the vectors they produce. They change how vectors are
+post-processed or reused without changing which provider (OpenAI, Google,
+HuggingFace) produces them, so they compose with any model returned by the
+vector DB factory.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+def normalize_vectors(vectors: List[List[float]]) -> np.ndarray:
+    """
+    L2-normalizes a batch of vectors.
+
+    Args:
+        vectors (List[List[float]]): Raw embedding vectors.
+
+    Returns:
+        np.ndarray: A float32 matrix of unit-length rows.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+    return matrix
+
+class NormalizedEmbeddings(Embeddings):
+    """
+    Returns unit-length vectors from the wrapped embedding model.
+
+    For unit-length vectors cosine similarity equals the inner product, so
+    indexes can score with a plain dot product instead of a cosine kernel.
+
+    With a query cache, `embed_query` serves repeated queries (e.g. from a
+    LangChain retriever) without a provider round-trip.
+
+    Attributes:
+        inner (Embeddings): The wrapped provider embedding model.
+        query_cache (Optional[QueryEmbeddingCache]): Cache of raw query vectors, if any.
+    """
+
+    def __init__(self, inner: Embeddings, query_cache: Optional["QueryEmbeddingCache"] = None):
+        """
+        Initializes the wrapper.
+
+        Args:
+            inner (Embeddings): The provider embedding model to normalize.
+            query_cache (Optional[QueryEmbeddingCache]): Cache for raw query vectors.
+        """
+        self.inner = inner
+        self.query_cache = query_cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embeds and normalizes a batch of documents."""
+        return normalize_vectors(self.inner.embed_documents(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embeds (or looks up) and normalizes a single query."""
+        if self.query_cache is None:
+            vector = self.inner.embed_query(text)
+        else:
+            vector = self.query_cache.get_or_embed([text], lambda texts: [self.inner.embed_query(t) for t in texts])[0]
+        return normalize_vectors([vector])[0].tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embeds and normalizes a batch of documents."""
+        return normalize_vectors(await self.inner.aembed_documents(texts)).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronously embeds (or looks up) and normalizes a single query."""
+        if self.query_cache is None:
+            vector = await self.inner.aembed_query(text)
+        else:
+            vector = await self.query_cache.aget_or_embed(text, self.inner.aembed_query)
+        return normalize_vectors([vector])[0].tolist()
+
+class BatchedEmbeddings(Embeddings):
+    """
+    Embeds documents in fixed-size batches, several batches in flight at once.
+
+    Remote providers spend most of an embedding call on the network round-trip,
+    so sending batches from a small thread pool overlaps that latency. Local
+    models are better served with `max_workers=1`, letting each batch run as
+    one large matrix product instead of competing for the same cores.
+
+    Repeated texts (boilerplate headers, identical rows under different
+    metadata) are embedded once and their vector reused for every copy.
+
+    Attributes:
+        inner (Embeddings): The wrapped embedding model.
+        batch_size (int): Number of texts per `embed_documents` call.
+        max_workers (int): Number of batches embedded concurrently.
+    """
+
+    def __init__(self, inner: Embeddings, batch_size: int = 256, max_workers: int = 8):
+        """
+        Initializes the wrapper.
+
+        Args:
+            inner (Embeddings): The embedding model to call per batch.
+            batch_size (int): Number of texts per `embed_documents` call.
+            max_workers (int): Number of batches embedded concurrently.
+        """
+        self.inner = inner
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        """Slices texts into consecutive batches of at most `batch_size`."""
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    @staticmethod
+    def _expand(texts: List[str], unique: List[str], vectors: List[List[float]]) -> List[List[float]]:
+        """Maps the vectors of the distinct texts back onto every input text."""
+        if len(unique) == len(texts):
+            return vectors
+        by_text = dict(zip(unique, vectors))
+        return [by_text[text] for text in texts]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embeds a list of documents batch by batch, preserving input order."""
+        unique = list(dict.fromkeys(texts))
+        batches = self._batches(unique)
+        if self.max_workers <= 1 or len(batches) <= 1:
+            results = map(self.inner.embed_documents, batches)
+            return self._expand(texts, unique, [vector for batch in results for vector in batch])
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+            vectors = [vector for batch in pool.map(self.inner.embed_documents, batches) for vector in batch]
+        return self._expand(texts, unique, vectors)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds documents with up to `max_workers` batch requests in flight.
+
+        Uses the wrapped model's async client, so concurrent requests share
+        one event loop instead of occupying a thread each.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def embed(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.inner.aembed_documents(batch)
+
+        unique = list(dict.fromkeys(texts))
+        results = await asyncio.gather(*(embed(batch) for batch in self._batches(unique)))
+        return self._expand(texts, unique, [vector for batch in results for vector in batch])
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embeds a single query with the wrapped model."""
+        return self.inner.embed_query(text)
+
+class CachedEmbeddings(Embeddings):
+    """
+    Persists document embeddings in SQLite, embedding only texts not seen before.
+
+    Vectors are keyed by sha256 of the model namespace and the text, and
+    stored as float32 bytes. Re-ingesting a corpus (including a full rebuild
+    after an index parameter change) then skips the provider for every
+    unchanged chunk.
+
+    Attributes:
+        inner (Embeddings): The embedding model called for cache misses.
+        namespace (str): Identifies the embedding model; part of every key.
+        path (str): Location of the SQLite database.
+    """
+
+    # Keys per SELECT, below SQLite's bound-parameter limit
+    LOOKUP_BATCH = 500
+
+    def __init__(self, inner: Embeddings, namespace: str, path: str):
+        """
+        Initializes the wrapper. The database is created on first use.
+
+        Args:
+            inner (Embeddings): The embedding model called for cache misses.
+            namespace (str): Identifies the embedding model (e.g. "openai:text-embedding-3-small").
+            path (str): Location of the SQLite database.
+        """
+        self.inner = inner
+        self.namespace = namespace
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database, creating it and its table if needed."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL) WITHOUT ROWID")
+        return conn
+
+    def _key(self, text: str) -> bytes:
+        """Returns the cache key of a text under this model."""
+        return hashlib.sha256(f"{self.namespace}\n{text}".encode("utf-8")).digest()
+
+    def _lookup(self, texts: List[str]) -> Tuple[List[bytes], Dict[bytes, List[float]]]:
+        """
+        Fetches the cached vectors for a batch of texts.
+
+        Args:
+            texts (List[str]): The texts to look up.
+
+        Returns:
+            Tuple[List[bytes], Dict[bytes, List[float]]]: The key of each text,
+            and the vectors found, by key.
+        """
+        keys = [self._key(text) for text in texts]
+        found = {}
+        with closing(self._connect()) as conn:
+            for start in range(0, len(keys), self.LOOKUP_BATCH):
+                batch = keys[start:start + self.LOOKUP_BATCH]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                )
+                found.update((key, np.frombuffer(blob, dtype=np.float32).tolist()) for key, blob in rows)
+        return keys, found
+
+    def _save(self, keys: List[bytes], vectors: List[List[float]]) -> None:
+        """Writes fresh vectors in one transaction."""
+        # One float32 conversion for the batch; each row is then a contiguous slice
+        matrix = np.asarray(vectors, dtype=np.float32)
+        rows = [(key, row.tobytes()) for key, row in zip(keys, matrix)]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+
+    def _merge(self, keys: List[bytes], found: Dict[bytes, List[float]], misses: List[int], fresh: List[List[float]]) -> List[List[float]]:
+        """Caches the fresh vectors and returns all vectors in input order."""
+        if misses:
+            miss_keys = [keys[i] for i in misses]
+            self._save(miss_keys, fresh)
+            found.update(zip(miss_keys, fresh))
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embeds documents, serving previously embedded texts from the cache."""
+        keys, found = self._lookup(texts)
+        misses = [i for i, key in enumerate(keys) if key not in found]
+        fresh = self.inner.embed_documents([texts[i] for i in misses]) if misses else []
+        return self._merge(keys, found, misses, fresh)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embeds documents, serving previously embedded texts from the cache."""
+        keys, found = self._lookup(texts)
+        misses = [i for i, key in enumerate(keys) if key not in found]
+        fresh = await self.inner.aembed_documents([texts[i] for i in misses]) if misses else []
+        return self._merge(keys, found, misses, fresh)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embeds a single query with the wrapped model (see `QueryEmbeddingCache`)."""
+        return self.inner.embed_query(text)
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache for query embeddings.
+
+    Tier 1 is an in-process LRU keyed by the exact query text. Tier 2 is a
+    content-addressed directory of `.npy` files (sha256 of the model namespace
+    and the query), which survives restarts and is shared by every worker on
+    the host. Repeated queries then skip the provider round-trip entirely.
+    Every distinct query adds a file, so the directory is capped at
+    `max_files`: once over, the least recently used files are deleted.
+
+    Attributes:
+        namespace (str): Identifies the embedding model; part of every disk key.
+        maxsize (int): Capacity of the in-memory LRU.
+        cache_dir (Optional[str]): Disk tier location, or None to disable it.
+        max_files (int): Capacity of the disk tier.
+    """
+
+    def __init__(self, namespace: str, maxsize: int = 4096, cache_dir: Optional[str] = None, max_files: int = 100_000):
+        """
+        Initializes an empty cache. The disk directory is created on first write.
+
+        Args:
+            namespace (str): Identifies the embedding model (e.g. "openai:text-embedding-3-small").
+            maxsize (int): Capacity of the in-memory LRU.
+            cache_dir (Optional[str]): Disk tier location, or None to disable it.
+            max_files (int): Capacity of the disk tier.
+        """
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        # Files in the disk tier, counted on the first write and then tracked
+        self._disk_files: Optional[int] = None
+        # Batched searches run on several executor threads at once.
+        self._lock = threading.Lock()
+
+    def get_or_embed(self, queries: List[str], embed_fn: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        """
+        Returns one embedding per query, embedding only the cache misses.
+
+        Args:
+            queries (List[str]): The raw query strings.
+            embed_fn (Callable): Embeds a list of queries in one call.
+
+        Returns:
+            List[List[float]]: One embedding per query, in input order.
+        """
+        vectors = [self._get(query) for query in queries]
+        missing = list(dict.fromkeys(q for q, v in zip(queries, vectors) if v is None))
+        if missing:
+            fresh = dict(zip(missing, embed_fn(missing)))
+            for query, vector in fresh.items():
+                self._put(query, vector)
+            vectors = [fresh[q] if v is None else v for q, v in zip(queries, vectors)]
+        return vectors
+
+    async def aget_or_embed(self, query: str, aembed_fn: Callable[[str], Awaitable[List[float]]]) -> List[float]:
+        """
+        Returns a query's embedding, awaiting `aembed_fn` only on a cache miss.
+
+        Args:
+            query (str): The raw query string.
+            aembed_fn (Callable): Asynchronously embeds one query.
+
+        Returns:
+            List[float]: The query embedding.
+        """
+        vector = self._get(query)
+        if vector is None:
+            vector = await aembed_fn(query)
+            self._put(query, vector)
+        return vector
+
+    def _path(self, query: str) -> str:
+        """Returns the content-addressed disk location for a query."""
+        digest = hashlib.sha256(f"{self.namespace}\n{query}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.npy")
+
+    def _get(self, query: str) -> Optional[List[float]]:
+        """Looks a query up in memory, then on disk (promoting disk hits)."""
+        with self._lock:
+            if query in self._memory:
+                self._memory.move_to_end(query)
+                return self._memory[query]
+
+        if self.cache_dir is None:
+            return None
+        path = self._path(query)
+        try:
+            vector = np.load(path).tolist()
+            # Marks the file as recently used for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        self._remember(query, vector)
+        return vector
+
+    def _put(self, query: str, vector: List[float]) -> None:
+        """Stores a fresh embedding in memory and on disk."""
+        self._remember(query, vector)
+        if self.cache_dir is None:
+            return
+        path = self._path(query)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.asarray(vector, dtype=np.float32))
+            # Atomic rename: concurrent workers never read a half-written file.
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best-effort; the memory tier already holds the vector.
+            return
+        with self._lock:
+            if self._disk_files is None:
+                self._disk_files = len(self._disk_entries())
+            else:
+                self._disk_files += 1
+            over = self._disk_files > self.max_files
+        if over:
+            self._evict_disk()
+
+    def _disk_entries(self) -> List[os.DirEntry]:
+        """Lists the cached vector files."""
+        with os.scandir(self.cache_dir) as entries:
+            return [entry for entry in entries if entry.name.endswith(".npy")]
+
+    def _evict_disk(self) -> None:
+        """
+        Deletes the least recently used files, down to 90% of `max_files`.
+
+        Rescans the directory, so files written by other workers are counted
+        too. Evicting below the cap spaces out the rescans.
+        """
+        try:
+            entries = self._disk_entries()
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+        except OSError:
+            return
+        keep = int(self.max_files * 0.9)
+        for entry in entries[:max(0, len(entries) - keep)]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                # Another worker evicted it first
+                pass
+        with self._lock:
+            self._disk_files = min(len(entries), keep)
+
+    def _remember(self, query: str, vector: List[float]) -> None:
+        """Inserts into the in-memory LRU, evicting the oldest entry when full."""
+        with self._lock:
+            self._memory[query] = vector
+            self._memory.move_to_end(query)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+class SemanticQueryCache:
+    """
+    Near-duplicate cache of search results, keyed by query vector.
+
+    Paraphrased queries ("python developer" / "python engineer") miss an
+    exact-text cache but embed to almost the same direction. Recent unit
+    query vectors are kept as rows of one matrix, so a whole batch of
+    queries is compared against every entry with a single matrix product;
+    a query whose best cosine similarity reaches `threshold` reuses that
+    entry's results and skips the index search.
+
+    Attributes:
+        maxsize (int): Maximum number of cached queries.
+        threshold (float): Minimum cosine similarity that counts as a hit.
+        generation (Optional[str]): The store version the cached results were
+            searched at; maintained by the caller, which clears the cache when it moves on.
+    """
+
+    def __init__(self, maxsize: int = 1024, threshold: float = 0.97):
+        """
+        Initializes an empty cache. The vector matrix is allocated on first insert.
+
+        Args:
+            maxsize (int): Maximum number of cached queries.
+            threshold (float): Minimum cosine similarity that counts as a hit.
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.generation: Optional[str] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._results: List[Any] = []
+        self._ks: List[int] = []
+        # Last-use tick per row; the smallest is evicted when the cache is full
+        self._used: List[int] = []
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, query_matrix: np.ndarray, k: int) -> List[Optional[Any]]:
+        """
+        Finds cached results for each query.
+
+        An entry only serves a query if it was searched with at least `k`
+        results; those are returned truncated to `k`.
+
+        Args:
+            query_matrix (np.ndarray): Unit query vectors, one row per query.
+            k (int): Number of results requested per query.
+
+        Returns:
+            List[Optional[Any]]: The cached results per query, or None on a miss.
+        """
+        with self._lock:
+            if not self._results:
+                return [None] * len(query_matrix)
+            sims = query_matrix @ self._vectors[:len(self._results)].T
+            best = sims.argmax(axis=1)
+            hits = []
+            for row, idx in enumerate(best):
+                if sims[row, idx] >= self.threshold and self._ks[idx] >= k:
+                    self._tick += 1
+                    self._used[idx] = self._tick
+                    hits.append(self._results[idx][:k])
+                else:
+                    hits.append(None)
+            return hits
+
+    def add(self, query_matrix: np.ndarray, k: int, results: List[Any]) -> None:
+        """
+        Stores fresh search results, evicting the least recently used entries.
+
+        Args:
+            query_matrix (np.ndarray): Unit query vectors, one row per query.
+            k (int): Number of results each search asked for.
+            results (List[Any]): The results of each query, in row order.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.empty((self.maxsize, query_matrix.shape[1]), dtype=np.float32)
+            for vector, result in zip(query_matrix, results):
+                self._tick += 1
+                if len(self._results) < self.maxsize:
+                    idx = len(self._results)
+                    self._results.append(result)
+                    self._ks.append(k)
+                    self._used.append(self._tick)
+                else:
+                    idx = int(np.argmin(self._used))
+                    self._results[idx], self._ks[idx], self._used[idx] = result, k, self._tick
+                self._vectors[idx] = vector
+
+    def clear(self) -> None:
+        """Drops every entry, e.g. after the underlying index changed."""
+        with self._lock:
+            self._vectors = None
+            self._results, self._ks, self._used = [], [], []
@@ -6,24 +6,396 @@ embedding models (OpenAI, Google, HuggingFace) and provides a secure
 property to access the underlying vector store engine.
 """
 
+import asyncio
+import importlib.util
+import json
 import os
 import shutil
-from typing import List, Optional
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import numpy as np
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_chroma import Chroma
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_core.vectorstores import VectorStoreRetriever
 
-# Imports for all supported embedding providers
-from langchain_openai import OpenAIEmbeddings
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
-
 from src.config import settings, EmbeddingProvider, VectorDBType
+from src.ingestion.chunks import Chunks
 from src.utils import setup_logger
 from src.retrieval.base import BaseVectorDB
+from src.retrieval.embeddings import (
+    BatchedEmbeddings,
+    CachedEmbeddings,
+    NormalizedEmbeddings,
+    QueryEmbeddingCache,
+    SemanticQueryCache,
+    normalize_vectors
+)
+
+if TYPE_CHECKING:
+    # Only for annotations; the OpenAI branch imports httpx when it is selected
+    import httpx
 
 logger = setup_logger(__name__)
 
+# Pre-quantized ONNX export published alongside sentence-transformers models
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Connection pool of the OpenAI embedding clients (covers ingestion and search concurrency)
+OPENAI_MAX_CONNECTIONS = 100
+OPENAI_MAX_KEEPALIVE = 50
+
+# Embedding models loaded in this process, keyed by `_embedding_namespace()`
+_embedding_models: Dict[str, Embeddings] = {}
+
+# Written into the store directory by every ingestion; cached search results are
+# only valid for the generation they were searched at
+GENERATION_FILE = "store_generation"
+
+def store_generation(persist_directory: Optional[str] = None) -> str:
+    """
+    Returns the current generation of a vector store on disk.
+
+    Every `create_vector_store` call writes a fresh random token next to the
+    store (even a failed one, which may have written or deleted records), so
+    search result caches keyed on it never serve results from before an
+    ingestion, including one run by another process such as the CLI. A
+    token rather than the file's mtime, whose clock ticks too coarsely to
+    tell back-to-back ingestions apart. (A FAISS index already loaded by a
+    running API is not reloaded; only the caches are dropped.)
+
+    Args:
+        persist_directory (Optional[str]): The store directory; defaults to `settings.vector_db_path`.
+
+    Returns:
+        str: The token of the last ingestion, or "" if the store was never ingested.
+    """
+    path = os.path.join(persist_directory or settings.vector_db_path, GENERATION_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def _bump_store_generation(persist_directory: str) -> None:
+    """Marks every cached search result for a store as stale (see `store_generation`)."""
+    path = os.path.join(persist_directory, GENERATION_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(persist_directory, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(os.urandom(8).hex())
+        # Atomic rename: readers never see an empty token
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not update the store generation in {persist_directory}: {e}")
+
+def _get_embedding_model() -> Embeddings:
+    """
+    Returns the configured embedding model, loading it once per process.
+
+    Loading a local model reads its weights from disk and warms it up, and
+    remote clients open connection pools, so every vector DB wrapper (and
+    repeated factory calls) shares one instance per provider and model.
+
+    Returns:
+        Embeddings: The shared LangChain embedding model instance.
+    """
+    namespace = _embedding_namespace()
+    if namespace not in _embedding_models:
+        _embedding_models[namespace] = _load_embedding_model()
+    return _embedding_models[namespace]
+
+def _load_embedding_model() -> Embeddings:
+    """
+    Selects and initializes the embedding model based on configuration.
+
+    Provider packages are imported here, so only the selected one (and its
+    HTTP, gRPC or torch stack) is loaded.
+    
+    Returns:
+        Embeddings: The initialized LangChain embedding model instance.
+        
+    Raises:
+        ValueError: If an unsupported provider is configured.
+    """
+    provider = settings.embedding_provider
+
+    if provider is EmbeddingProvider.OPENAI:
+        logger.info(f"Using OpenAI Embeddings: {settings.openai_embedding_model}")
+        return _openai_embeddings(_openai_http_client())
+    
+    elif provider is EmbeddingProvider.GOOGLE:
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        logger.info(f"Using Google Embeddings: {settings.google_embedding_model}")
+        return GoogleGenerativeAIEmbeddings(
+            model=settings.google_embedding_model,
+            google_api_key=settings.google_api_key
+        )
+        
+    elif provider is EmbeddingProvider.HUGGINGFACE:
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        logger.info(
+            f"Using Local HuggingFace Embeddings: {settings.huggingface_embedding_model} "
+            f"({settings.embedding_runtime})"
+        )
+        return HuggingFaceEmbeddings(
+            model_name=settings.huggingface_embedding_model,
+            model_kwargs=_huggingface_model_kwargs(),
+            encode_kwargs={"batch_size": settings.huggingface_batch_size}
+        )
+    
+    else:
+        raise ValueError(f"Unsupported Embedding Provider: {provider}")
+
+def _openai_embeddings(http_client: "httpx.Client", http_async_client: Optional["httpx.AsyncClient"] = None) -> Embeddings:
+    """
+    Builds the OpenAI embedding model on the given HTTP clients.
+
+    Args:
+        http_client (httpx.Client): The pooled sync client (see `_openai_http_client`).
+        http_async_client (Optional[httpx.AsyncClient]): A client bound to the
+            running event loop, for async embedding; None for sync use only.
+
+    Returns:
+        Embeddings: The OpenAI embedding model.
+    """
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(
+        model=settings.openai_embedding_model,
+        api_key=settings.openai_api_key,
+        # One HTTP request per ingestion batch (see `_ingestion_embeddings`)
+        chunk_size=settings.embedding_batch_size,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+def _openai_http_limits() -> "httpx.Limits":
+    """Returns the connection pool limits of the OpenAI HTTP clients."""
+    import httpx
+
+    return httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive_connections=OPENAI_MAX_KEEPALIVE)
+
+def _openai_http2() -> bool:
+    """Reports whether the `h2` package is installed, so the clients can speak HTTP/2."""
+    return importlib.util.find_spec("h2") is not None
+
+def _openai_http_client() -> "httpx.Client":
+    """
+    Builds the pooled sync HTTP client shared by the OpenAI embedding model.
+
+    Connections are kept alive between requests, so only the first request
+    (per connection) pays the TCP and TLS handshakes. With the `h2` package
+    installed, requests use HTTP/2 and concurrent batches are multiplexed
+    over one connection.
+
+    The memoized model gets no async client: an `httpx.AsyncClient` pools
+    connections bound to the event loop that opened them, and every
+    `create_vector_store` call runs its own loop (see `_ingestion_model`).
+
+    Returns:
+        httpx.Client: The sync client.
+    """
+    import httpx
+
+    return httpx.Client(http2=_openai_http2(), limits=_openai_http_limits())
+
+@asynccontextmanager
+async def _ingestion_model(embeddings: Embeddings) -> AsyncIterator[Embeddings]:
+    """
+    Yields the embedding model for one async ingestion run.
+
+    For OpenAI this is a copy of the shared model with an async HTTP client
+    opened on the running event loop and closed when the run ends, so a
+    later run on a new loop (another `asyncio.run`) never reuses connections
+    of a closed one. Other models are yielded unchanged.
+
+    Args:
+        embeddings (Embeddings): The shared provider embedding model.
+
+    Yields:
+        Embeddings: The model to embed this run's batches with.
+    """
+    if settings.embedding_provider is not EmbeddingProvider.OPENAI or not hasattr(embeddings, "http_client"):
+        yield embeddings
+        return
+
+    import httpx
+
+    async with httpx.AsyncClient(http2=_openai_http2(), limits=_openai_http_limits()) as http_async_client:
+        yield _openai_embeddings(embeddings.http_client, http_async_client)
+
+@lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """Reports whether PyTorch is installed and sees a CUDA device."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+def _huggingface_model_kwargs() -> dict:
+    """
+    Builds the SentenceTransformer arguments for the configured runtime.
+
+    The PyTorch runtime uses a CUDA device when one is available, with
+    float16 weights (half the memory traffic, tensor-core matmuls). The ONNX
+    runtimes run the model through ONNX Runtime (fused kernels, on CUDA with
+    the GPU build) instead of PyTorch eager mode; the model is exported on
+    first load when the hub has no ONNX file for it. "onnx-int8" loads the
+    dynamically quantized export, which uses VNNI int8 instructions on
+    modern x86.
+
+    Returns:
+        dict: Keyword arguments for `SentenceTransformer`.
+    """
+    if settings.embedding_runtime == "torch":
+        if _cuda_available():
+            return {"device": "cuda", "model_kwargs": {"torch_dtype": "float16"}}
+        return {}
+    model_kwargs = {"backend": "onnx"}
+    if settings.embedding_runtime == "onnx-int8":
+        model_kwargs["model_kwargs"] = {"file_name": ONNX_INT8_FILE}
+    elif _onnx_cuda_available():
+        # Dynamically quantized int8 kernels are CPU-only, so only fp32 moves to the GPU
+        model_kwargs["model_kwargs"] = {"provider": "CUDAExecutionProvider"}
+    return model_kwargs
+
+def _onnx_cuda_available() -> bool:
+    """Reports whether the installed ONNX Runtime build can run on CUDA."""
+    import onnxruntime
+
+    return "CUDAExecutionProvider" in onnxruntime.get_available_providers()
+
+def _embedding_namespace() -> str:
+    """
+    Identifies the configured embedding model, so cached vectors never cross models.
+
+    Returns:
+        str: A "<provider>:<model>" string.
+    """
+    provider = settings.embedding_provider
+    model = {
+        EmbeddingProvider.OPENAI: settings.openai_embedding_model,
+        EmbeddingProvider.GOOGLE: settings.google_embedding_model,
+        EmbeddingProvider.HUGGINGFACE: settings.huggingface_embedding_model,
+    }.get(provider)
+    if provider is EmbeddingProvider.HUGGINGFACE and settings.embedding_runtime != "torch":
+        # Quantized runtimes produce slightly different vectors.
+        return f"{provider.value}:{model}:{settings.embedding_runtime}"
+    if provider is EmbeddingProvider.HUGGINGFACE and _cuda_available():
+        # So do float16 weights on the GPU.
+        return f"{provider.value}:{model}:cuda-fp16"
+    return f"{provider.value}:{model}"
+
+def _new_query_cache() -> QueryEmbeddingCache:
+    """Creates the query embedding cache for the configured model."""
+    return QueryEmbeddingCache(
+        _embedding_namespace(),
+        maxsize=settings.query_embedding_cache_size,
+        cache_dir=settings.query_embedding_cache_dir,
+        max_files=settings.query_embedding_cache_max_files
+    )
+
+def _new_semantic_cache() -> Optional[SemanticQueryCache]:
+    """Creates the near-duplicate search result cache, or None if it is disabled."""
+    if settings.semantic_cache_size <= 0:
+        return None
+    return SemanticQueryCache(maxsize=settings.semantic_cache_size, threshold=settings.semantic_cache_threshold)
+
+def _search_with_cache(
+    cache: Optional[SemanticQueryCache],
+    query_matrix: np.ndarray,
+    k: int,
+    search_fn: Callable[[np.ndarray, int], List[List[Tuple[Document, float]]]],
+    persist_directory: str
+) -> List[List[Tuple[Document, float]]]:
+    """
+    Runs a batched search, serving near-duplicate queries from the semantic cache.
+
+    The cache is emptied once the store generation has moved on, and results
+    searched while an ingestion ran are not cached.
+
+    Args:
+        cache (Optional[SemanticQueryCache]): Recent results, or None to always search.
+        query_matrix (np.ndarray): Unit query vectors, one row per query.
+        k (int): Number of results to return per query.
+        search_fn (Callable): Searches the index for a matrix of query vectors.
+        persist_directory (str): The searched store's directory, for its generation.
+
+    Returns:
+        List[List[Tuple[Document, float]]]: Per-query documents with relevance scores.
+    """
+    if cache is None:
+        return search_fn(query_matrix, k)
+    generation = store_generation(persist_directory)
+    if cache.generation != generation:
+        cache.clear()
+        cache.generation = generation
+    results = cache.lookup(query_matrix, k)
+    misses = [i for i, hits in enumerate(results) if hits is None]
+    if misses:
+        fresh = search_fn(query_matrix[misses], k)
+        if store_generation(persist_directory) == generation:
+            cache.add(query_matrix[misses], k, fresh)
+        for i, hits in zip(misses, fresh):
+            results[i] = hits
+    return results
+
+def _ingestion_embeddings(embeddings: Embeddings) -> Embeddings:
+    """
+    Wraps an embedding model for bulk document ingestion.
+
+    Remote providers get several batches in flight to overlap network
+    round-trips; the local HuggingFace model embeds one batch at a time.
+    With `settings.document_embedding_cache_path`, texts embedded by an
+    earlier ingestion are served from disk and only the rest are batched.
+
+    The wrapper returns raw provider vectors; callers normalize each batch
+    into one float32 matrix (`normalize_vectors`) and hand that to the index
+    as-is, rather than round-tripping through nested Python lists.
+
+    Args:
+        embeddings (Embeddings): The provider embedding model.
+
+    Returns:
+        Embeddings: A (caching) batching wrapper around `embeddings`.
+    """
+    workers = 1 if settings.embedding_provider is EmbeddingProvider.HUGGINGFACE else settings.embedding_max_workers
+    batched = BatchedEmbeddings(embeddings, batch_size=settings.embedding_batch_size, max_workers=workers)
+    if not settings.document_embedding_cache_path:
+        return batched
+    return CachedEmbeddings(batched, _embedding_namespace(), settings.document_embedding_cache_path)
+
+def _embed_queries(embeddings: Embeddings, queries: List[str], cache: QueryEmbeddingCache) -> List[List[float]]:
+    """
+    Embeds several queries, serving repeats from the cache.
+
+    Cache misses are embedded together, in one provider request.
+
+    Args:
+        embeddings (Embeddings): The provider embedding model to use.
+        queries (List[str]): The raw query strings.
+        cache (QueryEmbeddingCache): Cache of previously embedded queries.
+
+    Returns:
+        List[List[float]]: One embedding per query.
+    """
+    if settings.embedding_provider is EmbeddingProvider.GOOGLE:
+        # Gemini embeds queries and documents with different task types; the
+        # batch endpoint takes the query task type that `embed_query` uses.
+        return cache.get_or_embed(queries, lambda texts: embeddings.embed_documents(texts, task_type="RETRIEVAL_QUERY"))
+    return cache.get_or_embed(queries, embeddings.embed_documents)
+
 class ChromaVectorDB(BaseVectorDB):
     """
     ChromaDB implementation of the vector store wrapper.
@@ -31,17 +403,41 @@ class ChromaVectorDB(BaseVectorDB):
     This class encapsulates the LangChain Chroma instance, providing 
     lifecycle management and a standardized interface for retrieval.
 
+    Vectors are L2-normalized before they are stored and the collection uses
+    the inner-product space, so Chroma scores with a plain dot product
+    (equal to cosine similarity for unit vectors) instead of its L2 kernel.
+    The HNSW graph is built and searched with the `settings.hnsw_*` parameters.
+
     Attributes:
         persist_directory (str): Local path where the vector DB is saved.
-        embeddings (Embeddings): The initialized LangChain embedding model.
+        embeddings (Embeddings): The normalized LangChain embedding model.
+        _query_cache (QueryEmbeddingCache): Cache of embedded search queries.
+        _semantic_cache (Optional[SemanticQueryCache]): Recent search results, served to near-duplicate queries.
         _store (Optional[Chroma]): Internal cache of the LangChain Chroma instance.
+        _retriever (Optional[VectorStoreRetriever]): The retriever over `_store`, once built.
     """
 
+    # Open collections shared by every instance, keyed by (persist directory, embedding namespace)
+    _stores: Dict[Tuple[str, str], Chroma] = {}
+    # Inner-product space: for unit vectors this is cosine without the per-vector norms
+    COLLECTION_CONFIGURATION = {"hnsw": {"space": "ip"}}
+    # Records the embedding model the stored vectors came from
+    MANIFEST_NAME = "ingest_manifest.json"
+
     def __init__(self):
         """Initializes ChromaDB wrapper with settings from the configuration."""
         self.persist_directory = settings.vector_db_path
-        self.embeddings = self._get_embedding_model()
+        self._query_cache = _new_query_cache()
+        self._semantic_cache = _new_semantic_cache()
+        # Retriever queries (RAG, CLI) share the batch search's query cache
+        self.embeddings = NormalizedEmbeddings(_get_embedding_model(), query_cache=self._query_cache)
         self._store = None
+        self._retriever = None
+
+    @staticmethod
+    def _relevance_score(distance: float) -> float:
+        """Maps a Chroma inner-product distance (1 - cosine for unit vectors) onto [0, 1]."""
+        return max(0.0, 1.0 - float(distance))
 
     @property
     def store(self) -> Chroma:
@@ -52,6 +448,10 @@ class ChromaVectorDB(BaseVectorDB):
         (e.g., similarity_search_with_relevance_scores) that aren't 
         available through the standard high-level retriever.
 
+        The opened collection is shared at class level, so later instances
+        (e.g. one per CLI or REPL query) skip re-reading the SQLite metadata
+        and reloading the HNSW index.
+
         Returns:
             Chroma: The initialized LangChain Chroma object.
 
@@ -59,50 +459,453 @@ class ChromaVectorDB(BaseVectorDB):
             FileNotFoundError: If the database hasn't been created on disk.
         """
         if self._store is None:
-            if not os.path.exists(self.persist_directory):
-                raise FileNotFoundError(f"No DB found at {self.persist_directory}")
-            self._store = Chroma(
-                persist_directory=self.persist_directory,
-                embedding_function=self.embeddings
-            )
+            key = (self.persist_directory, _embedding_namespace())
+            store = self._stores.get(key)
+            if store is None:
+                if not os.path.exists(self.persist_directory):
+                    raise FileNotFoundError(f"No DB found at {self.persist_directory}")
+                store = self._stores[key] = self._open_store()
+            self._store = store
         return self._store
 
-    def _get_embedding_model(self):
+    @classmethod
+    def _collection_configuration(cls) -> dict:
+        """Builds the collection configuration: the space plus the tuned HNSW parameters."""
+        return {"hnsw": {
+            **cls.COLLECTION_CONFIGURATION["hnsw"],
+            "max_neighbors": settings.hnsw_m,
+            "ef_construction": settings.hnsw_ef_construction,
+            "ef_search": settings.hnsw_ef_search
+        }}
+
+    def _open_store(self) -> Chroma:
         """
-        Selects and initializes the embedding model based on configuration.
-        
+        Opens (or creates) the inner-product collection at `persist_directory`.
+
+        Chroma applies the configuration only when it creates a collection, so
+        an existing collection gets the configured search beam width (the one
+        HNSW parameter that can change after build) applied here.
+
+        Returns:
+            Chroma: The opened LangChain Chroma object.
+        """
+        store = Chroma(
+            persist_directory=self.persist_directory,
+            embedding_function=self.embeddings,
+            collection_configuration=self._collection_configuration(),
+            relevance_score_fn=self._relevance_score
+        )
+        collection = store._collection
+        if (collection.configuration or {}).get("hnsw", {}).get("ef_search") != settings.hnsw_ef_search:
+            collection.modify(configuration={"hnsw": {"ef_search": settings.hnsw_ef_search}})
+        return store
+
+    def create_vector_store(self, chunks: List[Document]) -> None:
+        """
+        Persists document chunks to disk using the Chroma engine.
+
+        Synchronous entry point: runs `acreate_vector_store` on a fresh event loop.
+
+        Args:
+            chunks (List[Document]): Processed LangChain documents to be indexed.
+        """
+        asyncio.run(self.acreate_vector_store(chunks))
+
+    async def acreate_vector_store(self, chunks: List[Document]) -> None:
+        """
+        Persists document chunks to disk using the Chroma engine, asynchronously.
+
+        Embedding batches go through the provider's async client, with up to
+        `settings.embedding_max_workers` requests in flight, and the vectors
+        are written straight to the collection, so Chroma never re-embeds.
+        Callers already inside an event loop (e.g. an async server) await
+        this directly.
+
+        Ingestion is incremental: chunks get content-derived IDs (`chunk_id`),
+        and when the existing store was built with the same embedding model
+        only chunks with unseen IDs are embedded, while IDs no longer in the
+        corpus are deleted. A store built with another model is rebuilt.
+
+        New chunks are written in batches of `settings.ingest_batch_size` to a
+        single open collection (see `_aadd_chunks`). Batch latencies are
+        logged, with a warning when their p99 exceeds
+        `settings.ingest_batch_latency_slo_s` (a sign the batch size is past
+        the provider's sweet spot or the provider is throttling).
+
+        The documents are converted to columns (`Chunks`) once up front, so
+        the batches hand Chroma slices of plain lists.
+
+        Each batch is durable once written, and the manifest is saved before
+        the first batch, so an interrupted ingestion is resumed by the next
+        run: already-written IDs count as existing and are not re-embedded.
+
+        Args:
+            chunks (List[Document]): Processed LangChain documents to be indexed.
+        """
+        if not chunks:
+            logger.warning("No chunks provided for ingestion. Skipping.")
+            return
+
+        if settings.embedding_dtype != "fp32":
+            # hnswlib (Chroma's index) only stores float32 vectors
+            logger.warning(
+                f"EMBEDDING_DTYPE={settings.embedding_dtype} applies to FAISS only; Chroma stores float32 vectors. "
+                "Use VECTOR_DB_TYPE=faiss for quantized storage."
+            )
+
+        logger.info(f"Persisting {len(chunks)} chunks to {self.persist_directory}...")
+        try:
+            columns = Chunks.from_documents(chunks)
+            manifest = self._manifest()
+            if os.path.exists(self.persist_directory) and self._read_manifest() != manifest:
+                logger.warning("Existing DB was built with another embedding model or HNSW graph. Clearing to rebuild it.")
+                shutil.rmtree(self.persist_directory)
+
+            # Shared handles on this directory may point at the old collection
+            for key in [key for key in self._stores if key[0] == self.persist_directory]:
+                del self._stores[key]
+            self._store = self._open_store()
+            self._stores[(self.persist_directory, _embedding_namespace())] = self._store
+            collection = self._store._collection
+            # Marks the directory as this model's store, so a crash mid-way resumes instead of rebuilding
+            self._write_manifest(manifest)
+
+            # Exact duplicate chunks collapse into one record
+            wanted = dict(zip(columns.ids, range(len(columns))))
+            existing = set(collection.get(include=[])["ids"])
+            stale = [chunk_id for chunk_id in existing if chunk_id not in wanted]
+            for start in range(0, len(stale), settings.ingest_batch_size):
+                collection.delete(ids=stale[start:start + settings.ingest_batch_size])
+            # In ID order, so the ID index in Chroma's SQLite grows by appends instead of random page splits
+            new = columns.take([i for chunk_id, i in sorted(wanted.items()) if chunk_id not in existing])
+            logger.info(f"{len(new)} new chunks to embed, {len(wanted) - len(new)} unchanged, {len(stale)} removed.")
+
+            latencies = await self._aadd_chunks(new)
+
+            p99 = float(np.percentile(latencies, 99)) if latencies else 0.0
+            if p99 > settings.ingest_batch_latency_slo_s:
+                logger.warning(
+                    f"p99 ingestion batch latency {p99:.2f}s exceeds {settings.ingest_batch_latency_slo_s}s; "
+                    "consider a smaller INGEST_BATCH_SIZE."
+                )
+            logger.info("Vector store successfully created and persisted.")
+        except Exception as e:
+            logger.error(f"Failed to create vector store: {e}")
+            raise e
+        finally:
+            # Cached results may reference changed or removed chunks
+            _bump_store_generation(self.persist_directory)
+
+    def _manifest(self) -> dict:
+        """Describes what the collection's vectors and graph depend on."""
+        hnsw = self._collection_configuration()["hnsw"]
+        return {
+            "embedding": _embedding_namespace(),
+            "space": hnsw["space"],
+            # Fixed when the graph is built; changing them requires a rebuild
+            "max_neighbors": hnsw["max_neighbors"],
+            "ef_construction": hnsw["ef_construction"]
+        }
+
+    def _read_manifest(self) -> Optional[dict]:
+        """Reads the manifest saved by the last ingestion, if any."""
+        try:
+            with open(os.path.join(self.persist_directory, self.MANIFEST_NAME), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest: dict) -> None:
+        """Saves the manifest next to the collection files."""
+        os.makedirs(self.persist_directory, exist_ok=True)
+        with open(os.path.join(self.persist_directory, self.MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    async def _aadd_chunks(self, chunks: Chunks) -> List[float]:
+        """
+        Embeds and writes chunks to the open collection, batch by batch.
+
+        Each batch is embedded through the provider's async client with
+        several requests in flight (`BatchedEmbeddings.aembed_documents`),
+        then written with one `collection.add` call carrying the vectors.
+
+        Args:
+            chunks (Chunks): The chunks to index, with their record IDs.
+
         Returns:
-            Embeddings: The initialized LangChain embedding model instance.
-            
+            List[float]: Wall-clock seconds spent on each batch.
+
         Raises:
-            ValueError: If an unsupported provider is configured.
+            Exception: Whatever stopped a batch, after logging how many chunks were written.
         """
-        provider = settings.embedding_provider
+        async with _ingestion_model(self.embeddings.inner) as model:
+            embeddings = _ingestion_embeddings(model)
+            collection = self._store._collection
+            batch_size = settings.ingest_batch_size
+            num_batches = -(-len(chunks) // batch_size)
+            latencies = []
+            for start in range(0, len(chunks), batch_size):
+                started = time.perf_counter()
+                end = start + batch_size
+                texts = chunks.texts[start:end]
+                try:
+                    collection.add(
+                        ids=chunks.ids[start:end],
+                        # One (batch, dim) float32 matrix; Chroma takes it without conversion
+                        embeddings=normalize_vectors(await embeddings.aembed_documents(texts)),
+                        documents=texts,
+                        # Chroma rejects empty metadata dicts
+                        metadatas=[metadata or None for metadata in chunks.metadatas[start:end]]
+                    )
+                except Exception:
+                    logger.error(
+                        f"Ingestion batch {start // batch_size + 1}/{num_batches} failed after "
+                        f"{start}/{len(chunks)} new chunks were written; rerun to resume."
+                    )
+                    raise
+                latencies.append(time.perf_counter() - started)
+                logger.info(f"Ingested {start + len(texts)}/{len(chunks)} chunks ({latencies[-1]:.2f}s).")
+            return latencies
 
-        if provider == EmbeddingProvider.OPENAI:
-            logger.info(f"Using OpenAI Embeddings: {settings.openai_embedding_model}")
-            return OpenAIEmbeddings(
-                model=settings.openai_embedding_model,
-                api_key=settings.openai_api_key
+    def as_retriever(self) -> VectorStoreRetriever:
+        """
+        Returns the vector store as a standard LangChain retriever.
+
+        The retriever is built once per open store and reused by later calls
+        (e.g. one per `/ask` request).
+
+        Returns:
+            VectorStoreRetriever: A hydrated retriever with k=5.
+        """
+        store = self.store
+        if self._retriever is None or self._retriever.vectorstore is not store:
+            self._retriever = store.as_retriever(search_kwargs={"k": 5})
+        return self._retriever
+
+    def batch_similarity_search(self, queries: List[str], k: int) -> List[List[Tuple[Document, float]]]:
+        """
+        Searches the Chroma collection for several queries at once.
+
+        All queries are embedded together and sent to Chroma as one
+        `collection.query` call, which accepts a matrix of query embeddings.
+
+        Args:
+            queries (List[str]): The raw query strings.
+            k (int): Number of results to return per query.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: Per-query documents with relevance scores.
+        """
+        # The cache holds raw provider vectors; normalization is one cheap pass here.
+        query_matrix = normalize_vectors(_embed_queries(self.embeddings.inner, queries, self._query_cache))
+        return _search_with_cache(self._semantic_cache, query_matrix, k, self._search_vectors, self.persist_directory)
+
+    def _search_vectors(self, query_matrix: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+        """Runs one `collection.query` call for a matrix of unit query vectors."""
+        results = self.store._collection.query(
+            query_embeddings=query_matrix,
+            n_results=k,
+            include=["documents", "metadatas", "distances"]
+        )
+        return [
+            [
+                (Document(page_content=text, metadata=metadata or {}, id=doc_id), self._relevance_score(distance))
+                for text, metadata, doc_id, distance in zip(texts, metadatas, ids, distances)
+                if text is not None
+            ]
+            for texts, metadatas, ids, distances in zip(
+                results["documents"], results["metadatas"], results["ids"], results["distances"]
             )
-        
-        elif provider == EmbeddingProvider.GOOGLE:
-            logger.info(f"Using Google Embeddings: {settings.google_embedding_model}")
-            return GoogleGenerativeAIEmbeddings(
-                model=settings.google_embedding_model,
-                google_api_key=settings.google_api_key
+        ]
+
+class FaissVectorDB(BaseVectorDB):
+    """
+    FAISS implementation of the vector store wrapper.
+
+    Vectors are L2-normalized and scored with an inner-product metric, so
+    scores are cosine similarities. The index is either an exact flat scan,
+    an HNSW graph, or an IVF-PQ index (`settings.faiss_index_type`); the last
+    two give sub-linear search on large corpora, and IVF-PQ also compresses
+    each vector to `settings.pq_m` one-byte codes. Vectors are stored at `settings.embedding_dtype` precision (exact
+    float32, or fp16/int8 scalar-quantized codes that cut the bytes read per query);
+    with `settings.faiss_rerank_factor` the quantized scan only shortlists
+    candidates, which are re-scored against exact float32 copies.
+    The index is memory-mapped from disk (or loaded into memory) with a
+    docstore sidecar for metadata, which avoids the per-query SQLite
+    round-trips of a Chroma collection.
+
+    Attributes:
+        persist_directory (str): Local path where the index files are saved.
+        embeddings (Embeddings): The normalized LangChain embedding model.
+        _query_cache (QueryEmbeddingCache): Cache of embedded (raw) search queries.
+        _semantic_cache (Optional[SemanticQueryCache]): Recent search results, served to near-duplicate queries.
+        _store (Optional[FAISS]): Internal cache of the LangChain FAISS instance.
+        _retriever (Optional[VectorStoreRetriever]): The retriever over `_store`, once built.
+    """
+
+    INDEX_NAME = "index"
+    # FAISS index_factory storage component per `settings.embedding_dtype`
+    STORAGE_TYPES = {"fp32": "Flat", "fp16": "SQfp16", "int8": "SQ8"}
+    # Smallest corpus IVF-PQ can train: ~39 points per centroid of two clusters and 1-bit (2-centroid) codebooks
+    IVF_PQ_MIN_VECTORS = 39 * 2
+
+    def __init__(self):
+        """Initializes the FAISS wrapper with settings from the configuration."""
+        self.persist_directory = settings.vector_db_path
+        self._query_cache = _new_query_cache()
+        self._semantic_cache = _new_semantic_cache()
+        # Retriever queries (RAG, CLI) share the batch search's query cache
+        self.embeddings = NormalizedEmbeddings(_get_embedding_model(), query_cache=self._query_cache)
+        self._store = None
+        self._retriever = None
+
+    @staticmethod
+    def _relevance_score(score: float) -> float:
+        """Maps an inner product of unit vectors (cosine) onto [0, 1]."""
+        return max(0.0, float(score))
+
+    @staticmethod
+    def _index_factory_spec(num_vectors: int, dim: int) -> str:
+        """
+        Builds the FAISS index_factory string for the configured index type and precision.
+
+        IVF-PQ parameters are clamped to what the corpus can train (FAISS
+        wants about 39 points per k-means centroid, for both the coarse
+        clusters and each PQ codebook), and the sub-quantizer count must
+        divide the dimension. A corpus too small to train even 1-bit codebooks
+        (`IVF_PQ_MIN_VECTORS`) gets the exact Flat/SQ index instead.
+
+        Args:
+            num_vectors (int): Number of vectors the index is trained on.
+            dim (int): The embedding dimension.
+
+        Returns:
+            str: e.g. "Flat", "SQ8", "HNSW32_SQ8", "IVF4096,PQ64x8" or "SQ8,RFlat".
+        """
+        storage = FaissVectorDB.STORAGE_TYPES[settings.embedding_dtype]
+        if settings.faiss_index_type == "ivfpq" and num_vectors < FaissVectorDB.IVF_PQ_MIN_VECTORS:
+            logger.warning(
+                f"{num_vectors} vectors are too few to train IVF-PQ (needs {FaissVectorDB.IVF_PQ_MIN_VECTORS}); "
+                f"building a {storage} index instead."
             )
-            
-        elif provider == EmbeddingProvider.HUGGINGFACE:
-            logger.info(f"Using Local HuggingFace Embeddings: {settings.huggingface_embedding_model}")
-            return HuggingFaceEmbeddings(model_name=settings.huggingface_embedding_model)
-        
+            spec = storage
+        elif settings.faiss_index_type == "ivfpq":
+            nlist = max(1, min(settings.ivf_nlist, num_vectors // 39))
+            pq_m = max(m for m in range(1, min(settings.pq_m, dim) + 1) if dim % m == 0)
+            nbits = max(1, min(8, (num_vectors // 39).bit_length() - 1))
+            # PQ codes replace the scalar storage type
+            spec, storage = f"IVF{nlist},PQ{pq_m}x{nbits}", "PQ"
+        elif settings.faiss_index_type == "hnsw":
+            graph = f"HNSW{settings.hnsw_m}"
+            spec = graph if storage == "Flat" else f"{graph}_{storage}"
         else:
-            raise ValueError(f"Unsupported Embedding Provider: {provider}")
+            spec = storage
+        if storage != "Flat" and settings.faiss_rerank_factor > 0:
+            # Refine stage: the quantized index shortlists, exact vectors re-score
+            spec += ",RFlat"
+        return spec
+
+    @staticmethod
+    def _hnsw(index):
+        """Returns the HNSW graph of an index (looking through a refine stage), or None."""
+        faiss = dependable_faiss_import()
+        index = faiss.downcast_index(index)
+        if isinstance(index, faiss.IndexRefine):
+            index = faiss.downcast_index(index.base_index)
+        return getattr(index, "hnsw", None)
+
+    @staticmethod
+    def _tune_search(index) -> None:
+        """Applies query-time search parameters (HNSW beam width, IVF probes, re-rank depth) to the index."""
+        faiss = dependable_faiss_import()
+        hnsw = FaissVectorDB._hnsw(index)
+        if hnsw is not None:
+            hnsw.efSearch = settings.hnsw_ef_search
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = settings.ivf_nprobe
+        refine = faiss.downcast_index(index)
+        if isinstance(refine, faiss.IndexRefine):
+            refine.k_factor = max(1, settings.faiss_rerank_factor)
+
+    @staticmethod
+    def _read_flags() -> int:
+        """
+        Returns the `faiss.read_index` flags for the configured load mode.
+
+        With `settings.faiss_mmap`, the stored vector codes are memory-mapped
+        read-only instead of copied onto the heap: the kernel pages them in on
+        first touch, and every worker process on the host shares one page-cache
+        copy of the index.
+
+        Returns:
+            int: A bitmask of FAISS IO flags (0 loads the index into RAM).
+        """
+        if not settings.faiss_mmap:
+            return 0
+        faiss = dependable_faiss_import()
+        return faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+
+    def _build_index(self, vectors: np.ndarray):
+        """
+        Creates an empty inner-product index for the configured type and precision.
+
+        Scalar quantizers learn per-dimension value ranges, and IVF-PQ learns
+        its coarse centroids and PQ codebooks, so they are trained on the
+        vectors about to be added. HNSW graphs get their build-time beam
+        width before any vector is inserted.
+
+        Args:
+            vectors (np.ndarray): The normalized (N, d) float32 embedding matrix.
+
+        Returns:
+            faiss.Index: A trained, empty FAISS index.
+        """
+        faiss = dependable_faiss_import()
+        index = faiss.index_factory(
+            vectors.shape[1],
+            self._index_factory_spec(*vectors.shape),
+            faiss.METRIC_INNER_PRODUCT
+        )
+        hnsw = self._hnsw(index)
+        if hnsw is not None:
+            hnsw.efConstruction = settings.hnsw_ef_construction
+        self._tune_search(index)
+        if not index.is_trained:
+            index.train(vectors)
+        return index
+
+    @property
+    def store(self) -> FAISS:
+        """
+        Exposes the underlying LangChain FAISS instance.
+
+        Returns:
+            FAISS: The loaded LangChain FAISS object.
+
+        Raises:
+            FileNotFoundError: If the index hasn't been created on disk.
+        """
+        if self._store is None:
+            index_path = os.path.join(self.persist_directory, f"{self.INDEX_NAME}.faiss")
+            if not os.path.exists(index_path):
+                raise FileNotFoundError(f"No FAISS index found at {index_path}")
+            # The pickle sidecar is written by `create_vector_store` below.
+            self._store = FAISS.load_local(
+                self.persist_directory,
+                self.embeddings,
+                index_name=self.INDEX_NAME,
+                io_flags=self._read_flags(),
+                allow_dangerous_deserialization=True,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+                relevance_score_fn=self._relevance_score
+            )
+            self._tune_search(self._store.index)
+        return self._store
 
     def create_vector_store(self, chunks: List[Document]) -> None:
         """
-        Persists document chunks to disk using the Chroma engine.
+        Builds an inner-product index over the chunks and saves it to disk.
 
         Args:
             chunks (List[Document]): Processed LangChain documents to be indexed.
@@ -117,33 +920,87 @@ class ChromaVectorDB(BaseVectorDB):
                 logger.warning("Existing DB found. Clearing to prevent dimension mismatch.")
                 shutil.rmtree(self.persist_directory)
 
-            self._store = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                persist_directory=self.persist_directory
+            columns = Chunks.from_documents(chunks)
+            vectors = normalize_vectors(_ingestion_embeddings(self.embeddings.inner).embed_documents(columns.texts))
+
+            self._store = FAISS(
+                self.embeddings,
+                self._build_index(vectors),
+                InMemoryDocstore(),
+                {},
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+                relevance_score_fn=self._relevance_score
+            )
+            self._store.add_embeddings(
+                zip(columns.texts, vectors),
+                metadatas=columns.metadatas
             )
+            self._store.save_local(self.persist_directory, index_name=self.INDEX_NAME)
             logger.info("Vector store successfully created and persisted.")
         except Exception as e:
             logger.error(f"Failed to create vector store: {e}")
             raise e
+        finally:
+            # Cached results may reference the old index
+            _bump_store_generation(self.persist_directory)
 
     def as_retriever(self) -> VectorStoreRetriever:
         """
         Returns the vector store as a standard LangChain retriever.
 
+        The retriever is built once per open store and reused by later calls
+        (e.g. one per `/ask` request).
+
         Returns:
             VectorStoreRetriever: A hydrated retriever with k=5.
         """
-        return self.store.as_retriever(search_kwargs={"k": 5})
+        store = self.store
+        if self._retriever is None or self._retriever.vectorstore is not store:
+            self._retriever = store.as_retriever(search_kwargs={"k": 5})
+        return self._retriever
+
+    def batch_similarity_search(self, queries: List[str], k: int) -> List[List[Tuple[Document, float]]]:
+        """
+        Searches the FAISS index for several queries with one `index.search` call.
 
+        Args:
+            queries (List[str]): The raw query strings.
+            k (int): Number of results to return per query.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: Per-query documents with relevance scores.
+        """
+        # The cache holds raw provider vectors; normalization is one cheap pass here.
+        query_matrix = normalize_vectors(_embed_queries(self.embeddings.inner, queries, self._query_cache))
+        return _search_with_cache(self._semantic_cache, query_matrix, k, self._search_vectors, self.persist_directory)
+
+    def _search_vectors(self, query_matrix: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+        """Runs one `index.search` call for a matrix of unit query vectors."""
+        store = self.store
+        scores, indices = store.index.search(query_matrix, k)
+        return [
+            [
+                (store.docstore.search(store.index_to_docstore_id[i]), self._relevance_score(score))
+                for score, i in zip(row_scores, row_indices)
+                if i != -1
+            ]
+            for row_scores, row_indices in zip(scores, indices)
+        ]
+
+@lru_cache(maxsize=1)
 def get_vector_db() -> BaseVectorDB:
     """
     Factory function to retrieve the configured Vector DB instance.
+
+    Settings are frozen, so the instance is built once per process and
+    shared, along with its open store and query caches.
     
     Returns:
         BaseVectorDB: A concrete database instance (e.g., ChromaVectorDB).
     """
-    if settings.vector_db_type == VectorDBType.CHROMA:
+    if settings.vector_db_type is VectorDBType.CHROMA:
         return ChromaVectorDB()
+    elif settings.vector_db_type is VectorDBType.FAISS:
+        return FaissVectorDB()
     else:
         raise ValueError(f"Unsupported Vector DB Type: {settings.vector_db_type}")
\ No newline at end of file
@@ -7,11 +7,27 @@ setting defined in the application configuration.
 
 import logging
 import sys
+from functools import lru_cache
 from src.config import settings
 
+# Define the log format, shared by every handler
+# Example: 2023-10-27 10:00:00 - src.ingestion.loader - INFO - Loading docs...
+FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+
+# Log level from config (default to INFO); settings are frozen, so read once
+LOG_LEVEL = settings.log_level.upper()
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str) -> logging.Logger:
     """Configures and returns a logger instance.
 
+    Memoized per name, so repeated calls skip the setup. The handler is only
+    attached to a logger that has none, so a cache miss (after `cache_clear`
+    or a module reload) never duplicates log lines.
+
     Args:
         name (str): The name of the logger, typically __name__ of the module.
 
@@ -19,24 +35,13 @@ def setup_logger(name: str) -> logging.Logger:
         logging.Logger: A configured logger instance.
     """
     logger = logging.getLogger(name)
-    
+
     # Check if handlers are already set to prevent duplicate logs
     if not logger.handlers:
         # Create console handler
         handler = logging.StreamHandler(sys.stdout)
-        
-        # Define the log format
-        # Example: 2023-10-27 10:00:00 - src.ingestion.loader - INFO - Loading docs...
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-        
-        handler.setFormatter(formatter)
+        handler.setFormatter(FORMATTER)
         logger.addHandler(handler)
-        
-        # Set the log level from config (default to INFO)
-        log_level = settings.log_level.upper()
-        logger.setLevel(log_level)
+        logger.setLevel(LOG_LEVEL)
 
-    return logger
\ No newline at end of file
+    return logger
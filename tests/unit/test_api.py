@@ -0,0 +1,176 @@
+"""Unit tests for the FastAPI delivery layer.
+
+This module exercises the `/search` handler against an in-memory fake store
+patched in place of the vector DB factory, so no vector database or
+embedding model is required.
+"""
+
+import asyncio
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+from src.api.dependencies import SEARCH_RESULT_CACHE
+from src.api.main import app
+from src.api.batching import SearchBatcher
+from src.config import EmbeddingProvider
+
+@pytest.fixture
+def fake_db():
+    """Provides a fake vector DB wrapper and wires it into the handler."""
+    db = MagicMock()
+    db.batch_similarity_search.return_value = [[
+        (Document(page_content="Python role", metadata={"source": "Data Scientist", "row": 1}), 0.81234),
+        (Document(page_content="Unrelated role", metadata={"source": "Chef", "row": 2}), 0.1),
+    ]]
+    SEARCH_RESULT_CACHE.clear()
+    with patch("src.api.dependencies.get_vector_db", return_value=db):
+        yield db
+
+@pytest.mark.unit
+class TestSearchEndpoint:
+    """Tests for the `/search` handler logic."""
+
+    def test_search_filters_and_formats(self, fake_db):
+        """
+        Verify results are thresholded and mapped into the response schema.
+        """
+        client = TestClient(app)
+        response = client.post("/search", json={"query": "python", "k": 2})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) == 1
+        assert results[0] == {
+            "content": "Python role",
+            "source": "Data Scientist",
+            "job_title": "Data Scientist",
+            "score": 0.8123,
+            "id": 1
+        }
+        fake_db.batch_similarity_search.assert_called_once_with(["python"], 2)
+
+    def test_repeated_search_is_served_from_cache(self, fake_db):
+        """
+        Verify a repeated (query, k) pair, up to whitespace, skips the search.
+        """
+        client = TestClient(app)
+
+        first = client.post("/search", json={"query": "python", "k": 2})
+        second = client.post("/search", json={"query": "  python ", "k": 2})
+
+        assert second.json() == first.json()
+        fake_db.batch_similarity_search.assert_called_once()
+
+    def test_ingestion_invalidates_cached_results(self, fake_db):
+        """
+        Verify a search after an ingestion in this process is run again
+        instead of served from the result cache.
+        """
+        client = TestClient(app)
+
+        client.post("/search", json={"query": "python", "k": 2})
+        with patch("src.api.main.store_generation", return_value="next"):
+            client.post("/search", json={"query": "python", "k": 2})
+
+        assert fake_db.batch_similarity_search.call_count == 2
+
+    def test_search_missing_db_returns_503(self, fake_db):
+        """
+        Verify a missing database surfaces as 503 instead of a generic error.
+        """
+        fake_db.batch_similarity_search.side_effect = FileNotFoundError("no db")
+        client = TestClient(app)
+
+        response = client.post("/search", json={"query": "python"})
+
+        assert response.status_code == 503
+
+    def test_search_rejects_out_of_range_k(self, fake_db):
+        """
+        Verify request validation still rejects an invalid body with 422.
+        """
+        client = TestClient(app)
+
+        response = client.post("/search", json={"query": "python", "k": 50})
+
+        assert response.status_code == 422
+        fake_db.batch_similarity_search.assert_not_called()
+
+@pytest.mark.unit
+class TestStartup:
+    """Tests for the warm-up run before serving."""
+
+    @pytest.mark.parametrize("provider, warmed", [(EmbeddingProvider.HUGGINGFACE, True), (EmbeddingProvider.OPENAI, False)])
+    @patch("src.api.main.settings")
+    def test_startup_warms_store_and_local_model(self, mock_settings, fake_db, provider, warmed):
+        """
+        Verify startup opens the store and runs one query through a local
+        embedding model, but never calls a remote provider.
+        """
+        mock_settings.embedding_provider = provider
+
+        with TestClient(app):
+            pass
+
+        assert fake_db.embeddings.inner.embed_query.called is warmed
+        if warmed:
+            fake_db.embeddings.inner.embed_query.assert_called_once_with("warmup")
+
+@pytest.mark.unit
+class TestRAGEndpoint:
+    """Tests for the `/rag` handler logic."""
+
+    @patch("src.api.main.get_rag")
+    def test_rag_awaits_chain(self, mock_get_rag, fake_db):
+        """
+        Verify the question is answered through the async chain entry point.
+        """
+        mock_get_rag.return_value.ainvoke = AsyncMock(return_value="Use T-SQL.")
+        client = TestClient(app)
+
+        response = client.post("/rag", json={"question": "Which roles need T-SQL?"})
+
+        assert response.status_code == 200
+        assert response.json() == {"answer": "Use T-SQL."}
+        mock_get_rag.return_value.ainvoke.assert_awaited_once_with(
+            fake_db.as_retriever.return_value, "Which roles need T-SQL?"
+        )
+
+    @patch("src.api.main.get_rag")
+    def test_rag_builds_retriever_off_the_event_loop(self, mock_get_rag, fake_db):
+        """
+        Verify the DB is fetched (possibly loading the model and store) and
+        the retriever built on the search executor, not the event loop thread.
+        """
+        threads = []
+        with patch("src.api.dependencies.get_vector_db", side_effect=lambda: threads.append(threading.current_thread().name) or fake_db):
+            mock_get_rag.return_value.ainvoke = AsyncMock(return_value="Use T-SQL.")
+            client = TestClient(app)
+
+            client.post("/rag", json={"question": "Which roles need T-SQL?"})
+
+        assert threads and all(name.startswith("search") for name in threads)
+
+@pytest.mark.unit
+class TestSearchBatcher:
+    """Tests for the micro-batching of concurrent searches."""
+
+    async def test_concurrent_queries_share_one_call(self):
+        """
+        Verify concurrent queries are served by a single batched call,
+        each receiving its own top-k prefix.
+        """
+        docs = [(Document(page_content=str(i)), 1.0 - i / 10) for i in range(5)]
+        search_fn = MagicMock(side_effect=lambda queries, k: [docs[:k] for _ in queries])
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = SearchBatcher(search_fn, executor, max_batch=8, max_wait_ms=50)
+
+            first, second = await asyncio.gather(batcher.search("a", 2), batcher.search("b", 5))
+            await batcher.close()
+
+        search_fn.assert_called_once_with(["a", "b"], 5)
+        assert first == docs[:2]
+        assert second == docs[:5]
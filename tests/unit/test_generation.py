@@ -6,15 +6,19 @@ without incurring costs by making actual API calls.
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
 from src.generation.llm import RAGGenerator
+from src.config import LLMProvider
 
 @pytest.mark.unit
 class TestRAGGenerator:
     """Tests for LLM initialization and Chain construction."""
 
-    @patch("src.generation.llm.ChatOpenAI")
-    def test_get_chain(self, mock_chat):
+    @patch("src.generation.llm.settings")
+    @patch("langchain_openai.ChatOpenAI")
+    def test_get_chain(self, mock_chat, mock_settings):
         """
         Test that the LCEL (LangChain Expression Language) chain is constructed.
         
@@ -22,6 +26,7 @@ class TestRAGGenerator:
         processing inputs. We verify the structure of the return object 
         rather than its output, as the output depends on the mocked LLM.
         """
+        mock_settings.llm_provider = LLMProvider.OPENAI
         generator = RAGGenerator()
         mock_retriever = MagicMock()
         
@@ -29,4 +34,37 @@ class TestRAGGenerator:
         
         # The chain should be a Runnable (LangChain object)
         # We check for the 'invoke' method, which is the standard interface for LCEL chains
-        assert hasattr(chain, "invoke")
\ No newline at end of file
+        assert hasattr(chain, "invoke")
+
+    @patch("src.generation.llm.settings")
+    @patch("langchain_openai.ChatOpenAI")
+    def test_get_chain_is_cached_per_retriever(self, mock_chat, mock_settings):
+        """
+        Verify the chain is built once per retriever and rebuilt for a new one.
+        """
+        mock_settings.llm_provider = LLMProvider.OPENAI
+        generator = RAGGenerator()
+        retriever = MagicMock()
+
+        first = generator.get_chain(retriever)
+
+        assert generator.get_chain(retriever) is first
+        assert generator.get_chain(MagicMock()) is not first
+
+    @patch("src.generation.llm.settings")
+    @patch("langchain_openai.ChatOpenAI")
+    async def test_ainvoke_formats_context_into_prompt(self, mock_chat, mock_settings):
+        """
+        Verify the async path retrieves, fills the prompt and parses the reply.
+        """
+        mock_settings.llm_provider = LLMProvider.OPENAI
+        mock_chat.return_value.ainvoke = AsyncMock(return_value=AIMessage(content="Use T-SQL."))
+        retriever = MagicMock()
+        retriever.ainvoke = AsyncMock(return_value=[Document(page_content="SQL role"), Document(page_content="DBA")])
+
+        answer = await RAGGenerator().ainvoke(retriever, "Which roles need SQL?")
+
+        assert answer == "Use T-SQL."
+        prompt = mock_chat.return_value.ainvoke.call_args.args[0][0].content
+        assert "SQL role\n\nDBA" in prompt
+        assert "Which roles need SQL?" in prompt
@@ -10,11 +10,38 @@ Conventions:
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock, call, patch
 from langchain_core.documents import Document
-from src.ingestion.loader import load_documents
-from src.ingestion.splitter import split_documents
+from src.ingestion.loader import _list_files, _load_csv, _load_one, _load_pdf, load_documents
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from src.ingestion.splitter import FastRecursiveCharacterTextSplitter, split_documents
 from src.ingestion.manager import IngestionManager
+from src.ingestion.chunks import Chunks
+
+@pytest.fixture(scope="session")
+def csv_loader_cls():
+    """LangChain's CSVLoader, the reference for `_load_csv`; imported only by the tests that compare against it."""
+    return pytest.importorskip("langchain_community.document_loaders").CSVLoader
+
+@pytest.fixture(scope="module")
+def sample_docs():
+    """Two small documents, built once per module; a tuple, so tests cannot mutate the shared copy."""
+    return (
+        Document(page_content="Hello World", metadata={"source": "doc1.pdf"}),
+        Document(page_content="AI is great", metadata={"source": "doc2.pdf"}),
+    )
+
+# Long repetitive input shared by the splitter tests (the splitter never mutates it)
+_LONG_DOC = Document(page_content="text " * 1000, metadata={"source": "test"})
+
+def _fake_pdf(page_texts):
+    """Builds a stand-in for `pypdfium2.PdfDocument` with the given page texts."""
+    pdf = MagicMock()
+    pdf.__len__.return_value = len(page_texts)
+    pdf.__getitem__.side_effect = lambda i: MagicMock(
+        **{"get_textpage.return_value.get_text_range.return_value": page_texts[i]}
+    )
+    return pdf
 
 class TestLoader:
     """
@@ -24,29 +51,32 @@ class TestLoader:
     different file formats (PDF and CSV) from a target directory.
     """
 
-    @patch("src.ingestion.loader.PyPDFLoader")
-    @patch("src.ingestion.loader.CSVLoader")
-    @patch("src.ingestion.loader.glob.glob")
+    @patch("src.ingestion.loader._read_file", return_value=b"%PDF-")
+    @patch("src.ingestion.loader.settings")
+    @patch("src.ingestion.loader.pdfium.PdfDocument")
+    @patch("src.ingestion.loader._load_csv")
+    @patch("src.ingestion.loader._list_files")
     @patch("src.ingestion.loader.os.path.exists")
-    def test_load_documents_success(self, mock_exists, mock_glob, mock_csv_loader, mock_pdf_loader):
+    def test_load_documents_success(self, mock_exists, mock_list_files, mock_csv_loader, mock_pdf_loader, mock_settings, mock_read):
         """
         Verify that load_documents orchestrates both PDF and CSV loading.
 
         Verifies:
             - Directory existence check is performed.
-            - Glob is called twice (once for .pdf, once for .csv).
+            - The directory is scanned for .pdf and .csv files.
             - Results from different loaders are combined into a single list.
         """
-        # Setup: Mock environment and file discovery
+        # Setup: Mock environment and file discovery (in-process, so the mocks apply)
+        mock_settings.load_documents_num_workers = 1
+        mock_settings.pdf_pages_per_task = 16
+        mock_settings.pdf_prefetch_depth = 2
         mock_exists.return_value = True
-        mock_glob.side_effect = [["file.pdf"], ["file.csv"]]
+        mock_list_files.return_value = (["file.pdf"], ["file.csv"])
         
-        # Setup: Mock data returned by internal LangChain loaders
-        mock_pdf_instance = mock_pdf_loader.return_value
-        mock_pdf_instance.load.return_value = [Document(page_content="pdf content")]
+        # Setup: Mock data returned by the PDF reader and the CSV reader
+        mock_pdf_loader.return_value = _fake_pdf(["pdf content"])
         
-        mock_csv_instance = mock_csv_loader.return_value
-        mock_csv_instance.load.return_value = [Document(page_content="csv content")]
+        mock_csv_loader.return_value = [Document(page_content="csv content")]
 
         # Act: Execute the loader
         docs = load_documents("fake_dir")
@@ -55,32 +85,235 @@ class TestLoader:
         assert len(docs) == 2
         assert docs[0].page_content == "pdf content"
         assert docs[1].page_content == "csv content"
-        mock_pdf_loader.assert_called_once()
-        mock_csv_loader.assert_called_once()
+        mock_read.assert_called_with("file.pdf")
+        mock_pdf_loader.assert_called_with(b"%PDF-")
+        mock_csv_loader.assert_called_once_with("file.csv", source_column="Job Title")
+
+    @patch("src.ingestion.loader._read_file", return_value=b"%PDF-")
+    @patch("src.ingestion.loader.settings")
+    @patch("src.ingestion.loader.pdfium.PdfDocument")
+    @patch("src.ingestion.loader._list_files")
+    @patch("src.ingestion.loader.os.path.exists", return_value=True)
+    def test_large_pdf_is_split_into_page_ranges(self, mock_exists, mock_list_files, mock_reader, mock_settings, mock_read):
+        """
+        Verify a PDF is loaded as page-range tasks and reassembled in page order.
+        """
+        mock_settings.load_documents_num_workers = 1
+        mock_settings.pdf_pages_per_task = 2
+        mock_settings.pdf_prefetch_depth = 2
+        mock_list_files.return_value = (["big.pdf"], [])
+        mock_reader.return_value = _fake_pdf([f"page {i}" for i in range(5)])
+
+        with patch("src.ingestion.loader._load_pdf", wraps=_load_pdf) as spy:
+            docs = load_documents("fake_dir")
+
+        assert [call.args[1] for call in spy.call_args_list] == [range(0, 2), range(2, 4), range(4, 5)]
+        assert [doc.page_content for doc in docs] == [f"page {i}" for i in range(5)]
+        assert [doc.metadata["page"] for doc in docs] == list(range(5))
+        # The page ranges share one prefetched read of the file
+        mock_read.assert_called_once_with("big.pdf")
+
+    @patch("src.ingestion.loader._read_file")
+    @patch("src.ingestion.loader.pdfium.PdfDocument")
+    def test_page_range_without_prefetch_opens_by_path(self, mock_reader, mock_read):
+        """
+        Verify a page-range task without prefetched bytes (a pool worker)
+        opens the PDF by path instead of reading the whole file.
+        """
+        mock_reader.return_value = _fake_pdf([f"page {i}" for i in range(4)])
+
+        docs = _load_pdf("big.pdf", range(2, 4))
+
+        assert [doc.page_content for doc in docs] == ["page 2", "page 3"]
+        mock_reader.assert_called_once_with("big.pdf")
+        mock_read.assert_not_called()
+
+    @pytest.mark.parametrize("num_workers", [1, 2])
+    @patch("src.ingestion.loader.settings")
+    def test_load_documents_keeps_directory_order(self, mock_settings, num_workers, tmp_path):
+        """
+        Verify files come back in directory order, whether loaded in-process
+        or by worker processes.
+        """
+        mock_settings.load_documents_num_workers = num_workers
+        mock_settings.pdf_prefetch_depth = 2
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.csv").write_text(f"Job Title,Description\n{name.upper()} role,Does {name}\n", encoding="utf-8")
+
+        docs = load_documents(str(tmp_path))
+
+        expected = [doc for path in _list_files(str(tmp_path))[1] for doc in _load_one(path)]
+        assert [doc.metadata["source"] for doc in docs] == [doc.metadata["source"] for doc in expected]
+        assert sorted(doc.metadata["source"] for doc in docs) == ["A role", "B role", "C role"]
+
+    @patch("src.ingestion.loader.settings")
+    def test_metadata_strings_are_shared(self, mock_settings, tmp_path):
+        """
+        Verify equal metadata strings from worker processes end up as one object.
+        """
+        mock_settings.load_documents_num_workers = 2
+        for name in ("a", "b"):
+            (tmp_path / f"{name}.csv").write_text("Job Title,Description\nChef,Cooks\nChef,Bakes\n", encoding="utf-8")
+
+        docs = load_documents(str(tmp_path))
+
+        assert len(docs) == 4
+        assert len({id(doc.metadata["source"]) for doc in docs}) == 1
+
+    def test_csv_reader_matches_langchain_loader(self, csv_loader_cls, tmp_path):
+        """
+        Verify the Arrow CSV reader builds exactly the Documents CSVLoader does,
+        including quoted multi-line cells, numeric-looking text and empty cells.
+        """
+        path = tmp_path / "jobs.csv"
+        path.write_text(
+            'Job Title,Salary,Job Description\n'
+            '"Data Scientist ",007,"Builds models.\n\nUses Python, SQL."\n'
+            'Chef,,  Cooks  \n',
+            encoding="utf-8"
+        )
+
+        expected = csv_loader_cls(file_path=str(path), source_column="Job Title", encoding="utf-8").load()
+        docs = _load_csv(str(path))
+
+        assert [(d.page_content, d.metadata) for d in docs] == [(d.page_content, d.metadata) for d in expected]
 
 class TestSplitter:
     """
     Test suite for the Text Splitting/Chunking logic.
     """
 
-    def test_split_documents_logic(self):
-            """
-            Verify that the splitter creates multiple chunks from long text strings.
-
-            Verifies:
-                - The RecursiveCharacterTextSplitter is effectively breaking text.
-                - Metadata is preserved across chunks.
-            """
-            # Setup: One document with a repetitive long string
-            test_doc = [Document(page_content="text " * 1000, metadata={"source": "test"})]
-            
-            # FIX: Ensure chunk_size (500) is greater than global CHUNK_OVERLAP (200)
-            chunks = split_documents(test_doc, chunk_size=500)
-            
-            # Assert
-            assert len(chunks) > 1
-            assert chunks[0].metadata["source"] == "test"
-            assert isinstance(chunks[0], Document)
+    # FIX: Ensure chunk_size is greater than global CHUNK_OVERLAP (200)
+    @pytest.mark.parametrize("chunk_size", [300, 500, 1000])
+    @patch("src.ingestion.splitter.settings")
+    def test_split_documents_logic(self, mock_settings, chunk_size):
+        """
+        Verify that the splitter creates multiple chunks from long text strings.
+
+        Verifies:
+            - The RecursiveCharacterTextSplitter is effectively breaking text.
+            - No chunk exceeds the requested size.
+            - Metadata is preserved across chunks.
+        """
+        # Setup: One document with a repetitive long string (split cache off)
+        mock_settings.chunk_overlap = 200
+        mock_settings.split_cache_dir = None
+
+        chunks = split_documents([_LONG_DOC], chunk_size=chunk_size)
+
+        # Assert
+        assert len(chunks) > 1
+        assert max(len(chunk.page_content) for chunk in chunks) <= chunk_size
+        assert chunks[0].metadata["source"] == "test"
+        assert isinstance(chunks[0], Document)
+
+    @pytest.mark.parametrize("keep_separator", [True, False, "end"])
+    def test_fast_splitter_matches_langchain(self, keep_separator):
+        """
+        Verify the literal-separator splitter yields exactly LangChain's chunks.
+        """
+        text = ("Senior data engineer.\n\nBuilds pipelines in Python and SQL.\n" * 40 + "x" * 300 + " tail")
+        params = dict(chunk_size=120, chunk_overlap=30, keep_separator=keep_separator)
+
+        expected = RecursiveCharacterTextSplitter(**params).split_text(text)
+
+        assert FastRecursiveCharacterTextSplitter(**params).split_text(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "  \n\n ", "Chef\n\n\n\nCooks  ", " one line, short "])
+    @pytest.mark.parametrize("keep_separator", [True, False, "end"])
+    def test_fast_splitter_matches_langchain_on_short_text(self, text, keep_separator):
+        """
+        Verify the short-text fast path returns LangChain's chunks unchanged.
+        """
+        params = dict(chunk_size=120, chunk_overlap=30, keep_separator=keep_separator)
+
+        expected = RecursiveCharacterTextSplitter(**params).split_text(text)
+
+        assert FastRecursiveCharacterTextSplitter(**params).split_text(text) == expected
+
+    @patch("src.ingestion.splitter.settings")
+    def test_split_documents_accepts_page_iterator(self, mock_settings):
+        """
+        Verify a one-shot page iterator is fully consumed and split in order.
+        """
+        mock_settings.chunk_overlap = 0
+        mock_settings.split_cache_dir = None
+        drawn = []
+
+        def pages():
+            for i in range(3):
+                drawn.append(i)
+                yield Document(page_content=f"page {i}", metadata={"page": i})
+
+        chunks = split_documents(pages(), chunk_size=100)
+
+        assert drawn == [0, 1, 2]
+        assert [chunk.page_content for chunk in chunks] == ["page 0", "page 1", "page 2"]
+
+    @patch("src.ingestion.splitter.FastRecursiveCharacterTextSplitter.split_documents", autospec=True)
+    @patch("src.ingestion.splitter.settings")
+    def test_split_cache_only_splits_changed_documents(self, mock_settings, mock_split, tmp_path):
+        """
+        Verify a rerun reuses cached chunks and only splits new or edited documents.
+        """
+        mock_settings.chunk_overlap = 0
+        mock_settings.split_cache_dir = str(tmp_path / "chunks")
+        mock_split.side_effect = lambda self, docs: [Document(page_content=docs[0].page_content.upper())]
+        first = [Document(page_content="a"), Document(page_content="b")]
+
+        split_documents(first, chunk_size=100)
+        chunks = split_documents([first[0], Document(page_content="c")], chunk_size=100)
+
+        assert [chunk.page_content for chunk in chunks] == ["A", "C"]
+        assert [call.args[1][0].page_content for call in mock_split.call_args_list] == ["a", "b", "c"]
+
+    @patch("src.ingestion.splitter.FastRecursiveCharacterTextSplitter.split_documents", autospec=True)
+    @patch("src.ingestion.splitter.settings")
+    def test_split_cache_recovers_from_bad_entries(self, mock_settings, mock_split, tmp_path):
+        """
+        Verify an unreadable entry (e.g. pickled by another library version)
+        is re-split instead of failing ingestion, and stale entries are pruned.
+        """
+        mock_settings.chunk_overlap = 0
+        mock_settings.split_cache_dir = str(tmp_path / "chunks")
+        mock_split.side_effect = lambda self, docs: [Document(page_content=docs[0].page_content.upper())]
+        (tmp_path / "chunks" / "v0-old").mkdir(parents=True)
+
+        split_documents([Document(page_content="a"), Document(page_content="b")], chunk_size=100)
+        entries = list((tmp_path / "chunks").glob("*/*.pkl"))
+        for entry in entries:
+            entry.write_bytes(b"not a pickle")
+        chunks = split_documents([Document(page_content="a")], chunk_size=100)
+
+        assert [chunk.page_content for chunk in chunks] == ["A"]
+        assert mock_split.call_count == 3
+        assert len(entries) == 2
+        assert len(list((tmp_path / "chunks").glob("*/*.pkl"))) == 1
+        assert [path.name.startswith("v0-") for path in (tmp_path / "chunks").iterdir()] == [False]
+
+class TestChunks:
+    """
+    Test suite for the columnar chunk container.
+    """
+
+    def test_columns_round_trip_with_stable_ids(self):
+        """
+        Verify columns mirror the documents and IDs depend on text and metadata.
+        """
+        documents = [
+            Document(page_content="a", metadata={"page": 0}),
+            Document(page_content="a", metadata={"page": 1}),
+            Document(page_content="b", metadata={}),
+        ]
+
+        chunks = Chunks.from_documents(documents)
+
+        assert chunks.texts == ["a", "a", "b"]
+        assert chunks.metadatas == [{"page": 0}, {"page": 1}, {}]
+        assert len(set(chunks.ids)) == 3
+        assert Chunks.from_documents(documents).ids == chunks.ids
+        assert chunks.take([2, 0]).texts == ["b", "a"]
+        assert [doc.page_content for doc in chunks.as_documents()] == chunks.texts
 
 class TestIngestionManager:
     """
@@ -104,10 +337,10 @@ class TestIngestionManager:
         manager.load("data/raw")
 
         # Assert: Verification of the internal functional call
-        mock_load_fn.assert_called_once_with("data/raw")
+        assert mock_load_fn.call_args_list == [call("data/raw")]
 
     @patch("src.ingestion.manager.split_documents")
-    def test_manager_delegates_chunking(self, mock_split_fn):
+    def test_manager_delegates_chunking(self, mock_split_fn, sample_docs):
         """
         Verify that the Manager.chunk method delegates to the splitter.
 
@@ -116,10 +349,33 @@ class TestIngestionManager:
             - Optional parameters (chunk_size) are respected.
         """
         manager = IngestionManager()
-        sample_docs = [Document(page_content="test")]
         
         # Act
         manager.chunk(sample_docs, chunk_size=500)
         
         # Assert
-        mock_split_fn.assert_called_once_with(sample_docs, chunk_size=500)
\ No newline at end of file
+        assert mock_split_fn.call_args_list == [call(sample_docs, chunk_size=500)]
+
+    @patch("src.ingestion.splitter.settings")
+    @patch("src.ingestion.manager.iter_documents")
+    def test_manager_load_and_chunk_streams_batches(self, mock_iter_documents, mock_settings):
+        """
+        Verify each loaded batch is split before the next one is loaded.
+        """
+        mock_settings.chunk_overlap = 0
+        mock_settings.split_cache_dir = None
+        events = []
+
+        def batches(source):
+            for name in ("a", "b"):
+                events.append(f"load {name}")
+                yield [Document(page_content=name, metadata={"source": name})]
+
+        mock_iter_documents.side_effect = batches
+
+        for chunk in IngestionManager().load_and_chunk("data/raw", chunk_size=100):
+            events.append(f"chunk {chunk.page_content}")
+
+        assert mock_iter_documents.call_args_list == [call("data/raw")]
+        assert events == ["load a", "chunk a", "load b", "chunk b"]
+
@@ -5,9 +5,34 @@ It mocks the Factory functions and Manager classes to ensure that `main.py`
 is decoupled from concrete implementations and simply wires components together.
 """
 
+import importlib
 import pytest
-from unittest.mock import MagicMock, patch
-from src.main import ingest, query
+from unittest.mock import Mock, call, patch
+from src.generation.llm import RAGGenerator
+from src.ingestion.manager import IngestionManager
+from src.retrieval.base import BaseVectorDB
+
+# Retriever and chain stand-ins shared by the query tests; `shared_mocks` resets them
+_SHARED_RETRIEVER = Mock(name="retriever")
+_SHARED_CHAIN = Mock(name="chain")
+
+@pytest.fixture
+def shared_mocks():
+    """Yields the shared retriever and chain mocks, cleared of earlier calls and return values."""
+    for mock in (_SHARED_RETRIEVER, _SHARED_CHAIN):
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _SHARED_RETRIEVER, _SHARED_CHAIN
+
+@pytest.fixture(scope="session")
+def main_module():
+    """
+    Imports the CLI module on first use.
+
+    Importing `src.main` pulls in every factory, the LangChain generator and
+    the vector store clients, so deferring it keeps collection cheap for runs
+    (or xdist workers) that never reach these tests.
+    """
+    return importlib.import_module("src.main")
 
 @pytest.mark.unit
 class TestMainCLI:
@@ -17,60 +42,61 @@ class TestMainCLI:
 
     @patch("src.main.get_vector_db")  # <--- Mock the Factory
     @patch("src.main.IngestionManager")
-    def test_ingest_success(self, mock_manager_cls, mock_get_db):
+    def test_ingest_success(self, mock_manager_cls, mock_get_db, main_module):
         """
         Verify the 'ingest' command flow using the Factory Pattern.
         
         Expected Flow:
         1. Initialize IngestionManager.
-        2. Load documents -> Chunk documents.
+        2. Load and chunk documents in one streaming pass.
         3. Get Vector DB from Factory.
         4. Persist chunks to Vector DB.
         """
-        # Setup Mocks
-        mock_manager = mock_manager_cls.return_value
-        mock_db_instance = mock_get_db.return_value  # The object returned by factory
+        # Setup Mocks (spec'd, so calls to methods the classes lack fail the test)
+        mock_manager = mock_manager_cls.return_value = Mock(spec=IngestionManager)
+        mock_db_instance = mock_get_db.return_value = Mock(spec=BaseVectorDB)  # The object returned by factory
         
         # Simulate returning dummy data
-        mock_manager.load.return_value = ["doc1"]
-        mock_manager.chunk.return_value = ["chunk1", "chunk2"]
+        mock_manager.load_and_chunk.return_value = iter(["chunk1", "chunk2"])
 
         # Execute
-        ingest("dummy/dir")
+        main_module.ingest("dummy/dir")
 
         # Assertions
-        mock_manager.load.assert_called_once_with("dummy/dir")
+        assert mock_manager.load_and_chunk.call_args_list == [call("dummy/dir")]
         mock_get_db.assert_called_once() # Was the factory called?
-        mock_db_instance.create_vector_store.assert_called_once_with(["chunk1", "chunk2"]) # Was data persisted?
+        assert mock_db_instance.create_vector_store.call_args_list == [call(["chunk1", "chunk2"])] # Was data persisted?
 
     # --- Query Command Tests ---
 
-    @patch("src.main.RAGGenerator")
+    @patch("src.main.get_rag")
     @patch("src.main.get_vector_db") # <--- Mock the Factory
-    def test_query_success(self, mock_get_db, mock_rag_cls):
+    def test_query_success(self, mock_get_db, mock_get_rag, main_module, shared_mocks, capsys):
         """
         Verify the 'query' command flow using the Factory Pattern.
         
         Expected Flow:
         1. Get Vector DB from Factory.
         2. Initialize Retriever.
-        3. Initialize RAGGenerator and build Chain.
-        4. Invoke Chain with the question.
+        3. Get the shared RAGGenerator and build Chain.
+        4. Stream the Chain's answer for the question.
         """
-        # Setup Mocks
-        mock_db_instance = mock_get_db.return_value
-        mock_rag = mock_rag_cls.return_value
-        mock_chain = mock_rag.get_chain.return_value
+        # Setup Mocks (spec'd, so calls to methods the classes lack fail the test)
+        mock_db_instance = mock_get_db.return_value = Mock(spec=BaseVectorDB)
+        mock_rag = mock_get_rag.return_value = Mock(spec=RAGGenerator)
+        mock_retriever, mock_chain = shared_mocks
+        mock_rag.get_chain.return_value = mock_chain
+        mock_chain.stream.return_value = iter(["Artificial ", "intelligence."])
         
         # Simulate successful retrieval
-        mock_retriever = MagicMock()
         mock_db_instance.as_retriever.return_value = mock_retriever
         
         # Execute
-        query("What is AI?")
+        main_module.query("What is AI?")
 
         # Assertions
         mock_get_db.assert_called_once()
         mock_db_instance.as_retriever.assert_called_once()
-        mock_rag.get_chain.assert_called_once_with(mock_retriever)
-        mock_chain.invoke.assert_called_once_with("What is AI?")
\ No newline at end of file
+        assert mock_rag.get_chain.call_args_list == [call(mock_retriever)]
+        assert mock_chain.stream.call_args_list == [call("What is AI?")]
+        assert "Answer: Artificial intelligence." in capsys.readouterr().out
\ No newline at end of file
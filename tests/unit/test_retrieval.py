@@ -9,12 +9,83 @@ We extensively use mocking here to prevent:
 - Initializing heavy embedding models.
 """
 
+import asyncio
+import os
 import pytest
-from unittest.mock import MagicMock, patch
+
+# Checked before the LangChain and vector store imports below, so iterating
+# on ingestion code with SKIP_RETRIEVAL_TESTS=1 never pays for them
+if os.environ.get("SKIP_RETRIEVAL_TESTS"):
+    pytest.skip("retrieval tests disabled (SKIP_RETRIEVAL_TESTS)", allow_module_level=True)
+
+import httpx
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 from langchain_core.documents import Document
-from src.retrieval.vector_db import ChromaVectorDB, get_vector_db
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from src.retrieval import vector_db
+from src.retrieval.vector_db import ChromaVectorDB, FaissVectorDB, get_vector_db
+from src.retrieval.embeddings import (
+    BatchedEmbeddings,
+    CachedEmbeddings,
+    NormalizedEmbeddings,
+    QueryEmbeddingCache,
+    SemanticQueryCache,
+    normalize_vectors
+)
 from src.config import EmbeddingProvider, VectorDBType
 
+# Deselect with `pytest -m "unit and not retrieval"`
+pytestmark = pytest.mark.retrieval
+
+# Chunks for the mocked-collection tests, built once (ingestion never mutates them)
+_TEST_DOCS = tuple(Document(page_content=f"test {i}") for i in range(3))
+
+@pytest.fixture(autouse=True)
+def fresh_process_caches():
+    """Forgets the process-wide DB instance and embedding models between tests."""
+    get_vector_db.cache_clear()
+    vector_db._embedding_models.clear()
+    yield
+    get_vector_db.cache_clear()
+    vector_db._embedding_models.clear()
+
+@pytest.fixture
+def chroma_settings(tmp_path):
+    """
+    Installs plain settings for the Chroma tests (OpenAI embeddings, a store
+    under `tmp_path`, small batches); tests override single fields in place.
+
+    A `SimpleNamespace` rather than a MagicMock: setting a field is one dict
+    write, and a field the code reads but the test forgot raises instead of
+    returning a child mock.
+    """
+    fake = SimpleNamespace(
+        embedding_provider=EmbeddingProvider.OPENAI,
+        openai_embedding_model="text-embedding-test",
+        openai_api_key="sk-test-key",
+        google_embedding_model="models/embedding-test",
+        huggingface_embedding_model="all-MiniLM-L6-v2",
+        vector_db_type=VectorDBType.CHROMA,
+        vector_db_path=str(tmp_path / "chroma"),
+        embedding_dtype="fp32",
+        query_embedding_cache_size=16,
+        query_embedding_cache_dir=None,
+        query_embedding_cache_max_files=16,
+        semantic_cache_size=0,
+        semantic_cache_threshold=0.97,
+        embedding_batch_size=2,
+        embedding_max_workers=2,
+        document_embedding_cache_path=None,
+        ingest_batch_size=4,
+        ingest_batch_latency_slo_s=30.0,
+        hnsw_m=16,
+        hnsw_ef_construction=40,
+        hnsw_ef_search=16
+    )
+    with patch("src.retrieval.vector_db.settings", fake):
+        yield fake
+
 @pytest.mark.unit
 class TestRetrievalFactory:
     """Tests for the 'get_vector_db' factory function."""
@@ -28,12 +99,141 @@ class TestRetrievalFactory:
         mock_settings.vector_db_type = VectorDBType.CHROMA
         mock_settings.embedding_provider = EmbeddingProvider.OPENAI
         mock_settings.openai_embedding_model = "text-embedding-test"
+        mock_settings.semantic_cache_size = 0
         mock_settings.openai_api_key = "sk-test-key"
         
         # Call the function directly
         db_instance = get_vector_db()
         assert isinstance(db_instance, ChromaVectorDB)
 
+    @patch("langchain_huggingface.HuggingFaceEmbeddings")
+    @patch("src.retrieval.vector_db.settings")
+    def test_huggingface_onnx_int8_runtime(self, mock_settings, mock_hf):
+        """
+        Test that the int8 ONNX runtime loads the quantized export through
+        the SentenceTransformer ONNX backend.
+        """
+        mock_settings.vector_db_type = VectorDBType.CHROMA
+        mock_settings.embedding_provider = EmbeddingProvider.HUGGINGFACE
+        mock_settings.huggingface_embedding_model = "all-MiniLM-L6-v2"
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_runtime = "onnx-int8"
+
+        get_vector_db()
+
+        assert mock_hf.call_args.kwargs["model_kwargs"] == {
+            "backend": "onnx",
+            "model_kwargs": {"file_name": "onnx/model_qint8_avx512_vnni.onnx"}
+        }
+
+    @patch("onnxruntime.get_available_providers", return_value=["CUDAExecutionProvider", "CPUExecutionProvider"])
+    @patch("langchain_huggingface.HuggingFaceEmbeddings")
+    @patch("src.retrieval.vector_db.settings")
+    def test_huggingface_onnx_runtime_uses_cuda_provider(self, mock_settings, mock_hf, mock_providers):
+        """
+        Test that the fp32 ONNX runtime runs on CUDA when the GPU build of
+        ONNX Runtime is installed.
+        """
+        mock_settings.vector_db_type = VectorDBType.CHROMA
+        mock_settings.embedding_provider = EmbeddingProvider.HUGGINGFACE
+        mock_settings.huggingface_embedding_model = "all-MiniLM-L6-v2"
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_runtime = "onnx"
+
+        get_vector_db()
+
+        assert mock_hf.call_args.kwargs["model_kwargs"] == {
+            "backend": "onnx",
+            "model_kwargs": {"provider": "CUDAExecutionProvider"}
+        }
+
+    @patch("langchain_openai.OpenAIEmbeddings")
+    @patch("src.retrieval.vector_db.settings")
+    def test_openai_clients_keep_connections_alive(self, mock_settings, mock_openai):
+        """
+        Test that the shared OpenAI model gets a sync HTTP client with a
+        keep-alive connection pool, and no async client bound to an event loop.
+        """
+        mock_settings.vector_db_type = VectorDBType.CHROMA
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        mock_settings.openai_embedding_model = "text-embedding-test"
+        mock_settings.semantic_cache_size = 0
+
+        get_vector_db()
+
+        kwargs = mock_openai.call_args.kwargs
+        assert isinstance(kwargs["http_client"], httpx.Client)
+        assert kwargs["http_async_client"] is None
+        assert kwargs["http_client"]._transport._pool._max_keepalive_connections == vector_db.OPENAI_MAX_KEEPALIVE
+
+    @patch("src.retrieval.vector_db.settings")
+    def test_openai_ingestion_opens_an_async_client_per_run(self, mock_settings):
+        """
+        Test that each ingestion run (its own `asyncio.run`) embeds through a
+        fresh async client that is closed when the run ends, so a second run
+        never reuses connections of the first run's closed event loop.
+        """
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        mock_settings.openai_embedding_model = "text-embedding-test"
+        mock_settings.openai_api_key = "sk-test-key"
+        mock_settings.embedding_batch_size = 2
+        shared = vector_db._openai_embeddings(vector_db._openai_http_client())
+        clients = []
+
+        async def run():
+            async with vector_db._ingestion_model(shared) as model:
+                assert model.http_client is shared.http_client
+                assert not model.http_async_client.is_closed
+                clients.append(model.http_async_client)
+
+        asyncio.run(run())
+        asyncio.run(run())
+
+        assert clients[0] is not clients[1]
+        assert all(client.is_closed for client in clients)
+
+    @patch("src.retrieval.vector_db._cuda_available", return_value=True)
+    @patch("langchain_huggingface.HuggingFaceEmbeddings")
+    @patch("src.retrieval.vector_db.settings")
+    def test_huggingface_torch_runtime_uses_gpu_fp16(self, mock_settings, mock_hf, mock_cuda):
+        """
+        Test that the PyTorch runtime loads the model on CUDA in float16 when a
+        GPU is available, and keeps its vectors apart from fp32 ones.
+        """
+        mock_settings.vector_db_type = VectorDBType.CHROMA
+        mock_settings.embedding_provider = EmbeddingProvider.HUGGINGFACE
+        mock_settings.huggingface_embedding_model = "all-MiniLM-L6-v2"
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_runtime = "torch"
+        mock_settings.huggingface_batch_size = 128
+
+        get_vector_db()
+
+        assert mock_hf.call_args.kwargs["model_kwargs"] == {"device": "cuda", "model_kwargs": {"torch_dtype": "float16"}}
+        assert mock_hf.call_args.kwargs["encode_kwargs"] == {"batch_size": 128}
+        assert vector_db._embedding_namespace() == "huggingface:all-MiniLM-L6-v2:cuda-fp16"
+
+    @patch("langchain_huggingface.HuggingFaceEmbeddings")
+    @patch("src.retrieval.vector_db.settings")
+    def test_instance_and_model_are_shared(self, mock_settings, mock_hf):
+        """
+        Verify repeated factory calls return one instance, and wrappers built
+        directly reuse the already loaded embedding model.
+        """
+        mock_settings.vector_db_type = VectorDBType.CHROMA
+        mock_settings.embedding_provider = EmbeddingProvider.HUGGINGFACE
+        mock_settings.huggingface_embedding_model = "all-MiniLM-L6-v2"
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_runtime = "torch"
+
+        first = get_vector_db()
+        second = get_vector_db()
+        other = FaissVectorDB()
+
+        assert first is second
+        assert other.embeddings.inner is first.embeddings.inner
+        mock_hf.assert_called_once()
+
     @patch("src.retrieval.vector_db.settings")
     def test_get_vector_db_invalid(self, mock_settings):
         """
@@ -48,47 +248,544 @@ class TestRetrievalFactory:
 class TestChromaVectorDB:
     """Tests for the concrete ChromaDB implementation logic."""
 
-    @patch("src.retrieval.vector_db.settings")
     @patch("src.retrieval.vector_db.Chroma")
-    @patch("src.retrieval.vector_db.OpenAIEmbeddings")
-    @patch("src.retrieval.vector_db.os.path.exists", return_value=False) 
-    def test_create_vector_store(self, mock_exists, mock_embeddings, mock_chroma, mock_settings):
+    @patch("langchain_openai.OpenAIEmbeddings")
+    def test_create_vector_store(self, mock_embeddings, mock_chroma, chroma_settings):
         """
-        Test that document chunks are passed to ChromaDB correctly.
+        Test that document chunks are passed to ChromaDB correctly, in batches.
         """
-        # FIX 1: Set settings to valid strings/Enums
-        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
-        mock_settings.openai_embedding_model = "text-embedding-test"
-        mock_settings.openai_api_key = "sk-test-key"
+        chroma_settings.ingest_batch_size = 2
+        mock_embeddings.return_value.aembed_documents = AsyncMock(
+            side_effect=lambda texts: [[1.0, 0.0] for _ in texts]
+        )
         
         db = ChromaVectorDB()
-        docs = [Document(page_content="test")]
 
-        db.create_vector_store(docs)
+        db.create_vector_store(list(_TEST_DOCS))
 
-        mock_chroma.from_documents.assert_called_once()
+        mock_chroma.assert_called_once()
         
-        # FIX 2: Check kwargs instead of positional args
-        # Your code likely uses: Chroma.from_documents(documents=docs, ...)
-        call_args = mock_chroma.from_documents.call_args
-        assert call_args.kwargs['documents'] == docs 
+        # All chunks reach the collection in ID order, at most `ingest_batch_size` per call
+        add_calls = mock_chroma.return_value._collection.add.call_args_list
+        assert [len(c.kwargs["documents"]) for c in add_calls] == [2, 1]
+        ids = [chunk_id for c in add_calls for chunk_id in c.kwargs["ids"]]
+        assert ids == sorted(ids)
+        assert sorted(text for c in add_calls for text in c.kwargs["documents"]) == ["test 0", "test 1", "test 2"]
 
-    @patch("src.retrieval.vector_db.settings")
     @patch("src.retrieval.vector_db.Chroma")
-    @patch("src.retrieval.vector_db.OpenAIEmbeddings")
-    @patch("src.retrieval.vector_db.os.path.exists", return_value=True) 
-    def test_as_retriever_success(self, mock_exists, mock_embeddings, mock_chroma, mock_settings):
+    @patch("langchain_openai.OpenAIEmbeddings")
+    def test_as_retriever_success(self, mock_embeddings, mock_chroma, tmp_path, chroma_settings):
         """
         Test successful retriever initialization.
         """
-        # Set settings
-        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
-        mock_settings.openai_embedding_model = "text-embedding-test"
-        mock_settings.openai_api_key = "sk-test-key"
+        # The persist directory exists, so the store opens
+        chroma_settings.vector_db_path = str(tmp_path)
         
         db = ChromaVectorDB()
         retriever = db.as_retriever()
 
         mock_chroma.assert_called()
         # Verify we requested a retriever with the standard k=5 search kwargs
-        mock_chroma.return_value.as_retriever.assert_called_with(search_kwargs={"k": 5})
\ No newline at end of file
+        mock_chroma.return_value.as_retriever.assert_called_with(search_kwargs={"k": 5})
+
+        # Later calls reuse the retriever built for the same store
+        mock_chroma.return_value.as_retriever.return_value.vectorstore = mock_chroma.return_value
+        assert db.as_retriever() is retriever
+        mock_chroma.return_value.as_retriever.assert_called_once()
+
+    @patch("src.retrieval.vector_db.Chroma")
+    @patch("langchain_openai.OpenAIEmbeddings")
+    def test_store_is_shared_across_instances(self, mock_embeddings, mock_chroma, tmp_path, chroma_settings):
+        """
+        Test that a second wrapper reuses the open collection instead of reopening it.
+        """
+        chroma_settings.vector_db_path = str(tmp_path)
+
+        first = ChromaVectorDB().store
+        second = ChromaVectorDB().store
+
+        assert first is second
+        mock_chroma.assert_called_once()
+
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    def test_create_and_search_roundtrip(self, mock_get_model, chroma_settings):
+        """
+        Test that the inner-product collection scores an exact match with a
+        cosine relevance of ~1 after reopening it from disk.
+        """
+        chroma_settings.embedding_batch_size = 4
+        mock_get_model.return_value = DeterministicFakeEmbedding(size=32)
+        docs = [Document(page_content=f"job {i}", metadata={"source": f"Title {i}"}) for i in range(10)]
+
+        ChromaVectorDB().create_vector_store(docs)
+        results = ChromaVectorDB().batch_similarity_search(["job 3"], k=2)
+
+        assert results[0][0][0].metadata["source"] == "Title 3"
+        assert results[0][0][1] == pytest.approx(1.0, abs=1e-3)
+
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    def test_reingestion_embeds_only_new_chunks(self, mock_get_model, chroma_settings):
+        """
+        Test that re-ingesting reuses unchanged chunks, embeds only new
+        ones and deletes chunks that left the corpus.
+        """
+        chroma_settings.embedding_batch_size = 4
+        model = MagicMock(wraps=DeterministicFakeEmbedding(size=32))
+        mock_get_model.return_value = model
+        docs = [Document(page_content=f"job {i}", metadata={"source": f"Title {i}"}) for i in range(4)]
+
+        ChromaVectorDB().create_vector_store(docs[:3])
+        model.aembed_documents.reset_mock()
+        db = ChromaVectorDB()
+        db.create_vector_store([docs[0], docs[1], docs[3]])
+
+        embedded = [text for c in model.aembed_documents.call_args_list for text in c.args[0]]
+        assert embedded == ["job 3"]
+        stored = db.store._collection.get(include=["documents"])["documents"]
+        assert sorted(stored) == ["job 0", "job 1", "job 3"]
+
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    async def test_acreate_vector_store_inside_event_loop(self, mock_get_model, chroma_settings):
+        """
+        Test that ingestion can be awaited from a running event loop, where
+        the sync entry point's `asyncio.run` would fail.
+        """
+        mock_get_model.return_value = DeterministicFakeEmbedding(size=32)
+        docs = [Document(page_content=f"job {i}") for i in range(5)]
+
+        db = ChromaVectorDB()
+        await db.acreate_vector_store(docs)
+
+        assert db.store._collection.count() == 5
+
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    def test_interrupted_ingestion_resumes(self, mock_get_model, chroma_settings):
+        """
+        Test that a failure mid-ingestion names the failing batch, keeps the
+        written batches, and the next run embeds only the chunks that were
+        not written.
+        """
+        chroma_settings.embedding_max_workers = 1
+        chroma_settings.ingest_batch_size = 2
+        fake = DeterministicFakeEmbedding(size=32)
+        model = MagicMock(wraps=fake)
+        mock_get_model.return_value = model
+        docs = [Document(page_content=f"job {i}") for i in range(4)]
+
+        calls = []
+
+        async def flaky_embed(texts):
+            calls.append(texts)
+            if len(calls) > 1:
+                raise RuntimeError("rate limited")
+            return fake.embed_documents(texts)
+
+        model.aembed_documents = AsyncMock(side_effect=flaky_embed)
+        with pytest.raises(RuntimeError), patch("src.retrieval.vector_db.logger") as mock_logger:
+            ChromaVectorDB().create_vector_store(docs)
+        assert "batch 2/2 failed after 2/4" in mock_logger.error.call_args_list[0].args[0]
+
+        model.aembed_documents = AsyncMock(side_effect=fake.aembed_documents)
+        ChromaVectorDB().create_vector_store(docs)
+
+        embedded = [text for c in model.aembed_documents.call_args_list for text in c.args[0]]
+        assert sorted(embedded) == sorted({doc.page_content for doc in docs} - set(calls[0]))
+        stored = ChromaVectorDB().store._collection.get(include=["documents"])["documents"]
+        assert sorted(stored) == [f"job {i}" for i in range(4)]
+
+@pytest.mark.unit
+class TestFaissVectorDB:
+    """Tests for the FAISS implementation (real index, fake embeddings)."""
+
+    @patch("src.retrieval.vector_db.settings")
+    def test_get_vector_db_returns_faiss(self, mock_settings):
+        """
+        Verify the factory returns FaissVectorDB when configured.
+        """
+        mock_settings.vector_db_type = VectorDBType.FAISS
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        mock_settings.openai_embedding_model = "text-embedding-test"
+        mock_settings.semantic_cache_size = 0
+        mock_settings.openai_api_key = "sk-test-key"
+
+        assert isinstance(get_vector_db(), FaissVectorDB)
+
+    @pytest.mark.parametrize("rerank_factor", [0, 4])
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    @pytest.mark.parametrize("embedding_dtype", ["fp32", "fp16", "int8"])
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    @patch("src.retrieval.vector_db.settings")
+    def test_create_and_search_roundtrip(self, mock_settings, mock_get_model, embedding_dtype, index_type, rerank_factor, tmp_path):
+        """
+        Test that an index built at ingestion is reloaded from disk and
+        returns the exact match first with a cosine score of ~1, for every
+        index type and storage precision, with and without exact re-ranking.
+        """
+        mock_settings.vector_db_path = str(tmp_path / "faiss")
+        mock_settings.embedding_dtype = embedding_dtype
+        mock_settings.faiss_index_type = index_type
+        mock_settings.hnsw_m = 16
+        mock_settings.hnsw_ef_construction = 40
+        mock_settings.hnsw_ef_search = 16
+        mock_settings.faiss_rerank_factor = rerank_factor
+        mock_settings.faiss_mmap = True
+        mock_settings.query_embedding_cache_size = 16
+        mock_settings.query_embedding_cache_dir = None
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_batch_size = 4
+        mock_settings.embedding_max_workers = 2
+        mock_settings.document_embedding_cache_path = None
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        mock_get_model.return_value = DeterministicFakeEmbedding(size=32)
+        docs = [Document(page_content=f"job {i}", metadata={"source": f"Title {i}"}) for i in range(10)]
+
+        FaissVectorDB().create_vector_store(docs)
+        results = FaissVectorDB().batch_similarity_search(["job 3", "job 7"], k=2)
+
+        assert [len(row) for row in results] == [2, 2]
+        assert results[0][0][0].metadata["source"] == "Title 3"
+        assert results[1][0][0].page_content == "job 7"
+        assert results[0][0][1] == pytest.approx(1.0, abs=1e-5 if rerank_factor else 1e-2)
+
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    @patch("src.retrieval.vector_db.settings")
+    def test_ivfpq_roundtrip_with_rerank(self, mock_settings, mock_get_model, tmp_path):
+        """
+        Test that an IVF-PQ index, clamped to a tiny corpus, is trained,
+        reloaded with its probe count, and re-ranks the exact match to the top.
+        """
+        mock_settings.vector_db_path = str(tmp_path / "faiss")
+        mock_settings.embedding_dtype = "fp32"
+        mock_settings.faiss_index_type = "ivfpq"
+        mock_settings.ivf_nlist = 4096
+        mock_settings.ivf_nprobe = 8
+        mock_settings.pq_m = 6
+        mock_settings.faiss_rerank_factor = 10
+        mock_settings.faiss_mmap = True
+        mock_settings.query_embedding_cache_size = 16
+        mock_settings.query_embedding_cache_dir = None
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_batch_size = 64
+        mock_settings.embedding_max_workers = 1
+        mock_settings.document_embedding_cache_path = None
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        mock_get_model.return_value = DeterministicFakeEmbedding(size=32)
+        docs = [Document(page_content=f"job {i}") for i in range(100)]
+
+        FaissVectorDB().create_vector_store(docs)
+        db = FaissVectorDB()
+        results = db.batch_similarity_search(["job 42"], k=3)
+
+        assert FaissVectorDB._index_factory_spec(100, 32) == "IVF2,PQ4x1,RFlat"
+        assert results[0][0][0].page_content == "job 42"
+        assert results[0][0][1] == pytest.approx(1.0, abs=1e-5)
+
+    @pytest.mark.parametrize("dtype, spec", [("fp32", "Flat"), ("int8", "SQ8,RFlat")])
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    @patch("src.retrieval.vector_db.settings")
+    def test_ivfpq_falls_back_on_tiny_corpus(self, mock_settings, mock_get_model, dtype, spec, tmp_path):
+        """
+        Test that a corpus too small to train IVF-PQ gets an exact Flat/SQ
+        index instead of failing in k-means.
+        """
+        mock_settings.vector_db_path = str(tmp_path / "faiss")
+        mock_settings.embedding_dtype = dtype
+        mock_settings.faiss_index_type = "ivfpq"
+        mock_settings.ivf_nlist = 4096
+        mock_settings.ivf_nprobe = 8
+        mock_settings.pq_m = 6
+        mock_settings.faiss_rerank_factor = 10
+        mock_settings.faiss_mmap = True
+        mock_settings.query_embedding_cache_size = 16
+        mock_settings.query_embedding_cache_dir = None
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_batch_size = 64
+        mock_settings.embedding_max_workers = 1
+        mock_settings.document_embedding_cache_path = None
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        mock_get_model.return_value = DeterministicFakeEmbedding(size=32)
+
+        FaissVectorDB().create_vector_store([Document(page_content="only job")])
+        results = FaissVectorDB().batch_similarity_search(["only job"], k=1)
+
+        assert FaissVectorDB._index_factory_spec(FaissVectorDB.IVF_PQ_MIN_VECTORS - 1, 32) == spec
+        assert FaissVectorDB._index_factory_spec(FaissVectorDB.IVF_PQ_MIN_VECTORS, 32).startswith("IVF2,PQ")
+        assert results[0][0][0].page_content == "only job"
+
+@pytest.mark.unit
+class TestBatchedEmbeddings:
+    """Tests for the batching wrapper used at ingestion."""
+
+    def test_batches_preserve_input_order(self):
+        """
+        Verify texts are sent in fixed-size batches and the vectors come
+        back in input order when several batches run concurrently.
+        """
+        inner = MagicMock()
+        inner.embed_documents.side_effect = lambda texts: [[float(t)] for t in texts]
+        texts = [str(i) for i in range(10)]
+
+        vectors = BatchedEmbeddings(inner, batch_size=3, max_workers=4).embed_documents(texts)
+
+        assert vectors == [[float(i)] for i in range(10)]
+        assert sorted(len(c.args[0]) for c in inner.embed_documents.call_args_list) == [1, 3, 3, 3]
+
+    async def test_async_batches_bounded_and_ordered(self):
+        """
+        Verify async embedding keeps at most `max_workers` requests in flight
+        and returns vectors in input order.
+        """
+        in_flight, peak = 0, 0
+
+        async def aembed(texts):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [[float(t)] for t in texts]
+
+        inner = MagicMock()
+        inner.aembed_documents = aembed
+
+        vectors = await BatchedEmbeddings(inner, batch_size=2, max_workers=3).aembed_documents([str(i) for i in range(11)])
+
+        assert vectors == [[float(i)] for i in range(11)]
+        assert peak == 3
+
+    def test_duplicate_texts_embedded_once(self):
+        """
+        Verify repeated texts reach the provider once and every copy gets
+        the vector, in input order.
+        """
+        inner = MagicMock()
+        inner.embed_documents.side_effect = lambda texts: [[float(t)] for t in texts]
+
+        vectors = BatchedEmbeddings(inner, batch_size=2, max_workers=1).embed_documents(["1", "2", "1", "3", "2"])
+
+        assert vectors == [[1.0], [2.0], [1.0], [3.0], [2.0]]
+        assert [c.args[0] for c in inner.embed_documents.call_args_list] == [["1", "2"], ["3"]]
+
+@pytest.mark.unit
+class TestCachedEmbeddings:
+    """Tests for the persistent document embedding cache."""
+
+    def test_only_unseen_texts_are_embedded(self, tmp_path):
+        """
+        Verify a second instance on the same database embeds only new texts
+        and returns every vector in input order.
+        """
+        path = str(tmp_path / "cache" / "docs.sqlite")
+        inner = MagicMock()
+        inner.embed_documents.side_effect = lambda texts: [[float(len(t)), 0.5] for t in texts]
+
+        first = CachedEmbeddings(inner, "model-a", path).embed_documents(["a", "bb"])
+        second = CachedEmbeddings(inner, "model-a", path).embed_documents(["ccc", "a", "bb"])
+
+        assert first == [[1.0, 0.5], [2.0, 0.5]]
+        assert second == [[3.0, 0.5], [1.0, 0.5], [2.0, 0.5]]
+        assert [c.args[0] for c in inner.embed_documents.call_args_list] == [["a", "bb"], ["ccc"]]
+
+    async def test_models_do_not_share_vectors(self, tmp_path):
+        """
+        Verify the async path caches too, and vectors never cross model namespaces.
+        """
+        path = str(tmp_path / "docs.sqlite")
+        inner = MagicMock()
+        inner.aembed_documents = AsyncMock(side_effect=lambda texts: [[1.0] for _ in texts])
+
+        await CachedEmbeddings(inner, "model-a", path).aembed_documents(["a"])
+        await CachedEmbeddings(inner, "model-a", path).aembed_documents(["a"])
+        await CachedEmbeddings(inner, "model-b", path).aembed_documents(["a"])
+
+        assert inner.aembed_documents.await_count == 2
+
+@pytest.mark.unit
+class TestQueryEmbeddingCache:
+    """Tests for the two-tier query embedding cache."""
+
+    def test_repeats_skip_the_provider(self):
+        """
+        Verify only unseen queries reach the embed function, once each.
+        """
+        embed_fn = MagicMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+        cache = QueryEmbeddingCache("test:model", maxsize=8)
+
+        cache.get_or_embed(["a", "bb", "a"], embed_fn)
+        vectors = cache.get_or_embed(["bb", "ccc"], embed_fn)
+
+        assert vectors == [[2.0], [3.0]]
+        assert [c.args[0] for c in embed_fn.call_args_list] == [["a", "bb"], ["ccc"]]
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """
+        Verify a fresh cache (e.g. after a restart) reads vectors from disk.
+        """
+        QueryEmbeddingCache("test:model", cache_dir=str(tmp_path)).get_or_embed(["q"], lambda t: [[0.5, 1.5]])
+        embed_fn = MagicMock()
+
+        vectors = QueryEmbeddingCache("test:model", cache_dir=str(tmp_path)).get_or_embed(["q"], embed_fn)
+
+        assert vectors == [[0.5, 1.5]]
+        embed_fn.assert_not_called()
+
+    def test_disk_tier_evicts_least_recently_used(self, tmp_path):
+        """
+        Verify the disk tier stays under its file cap, keeping recently read queries.
+        """
+        def embed_fn(texts):
+            return [[float(len(t))] for t in texts]
+
+        cache = QueryEmbeddingCache("test:model", maxsize=1, cache_dir=str(tmp_path), max_files=3)
+        cache.get_or_embed(["a"], embed_fn)
+        cache.get_or_embed(["bb"], embed_fn)
+        cache.get_or_embed(["ccc"], embed_fn)
+        # Ages "bb" and "ccc" so the read of "a" below is the most recent use
+        for path in tmp_path.iterdir():
+            os.utime(path, (0, 0))
+        cache.get_or_embed(["a"], MagicMock())
+        cache.get_or_embed(["dddd"], embed_fn)
+
+        assert len(list(tmp_path.glob("*.npy"))) == 2
+        fresh = QueryEmbeddingCache("test:model", cache_dir=str(tmp_path))
+        assert fresh.get_or_embed(["a", "dddd"], MagicMock()) == [[1.0], [4.0]]
+
+    @patch("src.retrieval.vector_db.settings")
+    def test_google_queries_embed_in_one_request(self, mock_settings):
+        """
+        Verify a batch of Gemini queries is one `embed_documents` request
+        with the query task type, rather than one `embed_query` per query.
+        """
+        mock_settings.embedding_provider = EmbeddingProvider.GOOGLE
+        model = MagicMock()
+        model.embed_documents.return_value = [[1.0], [2.0]]
+
+        vectors = vector_db._embed_queries(model, ["a", "b"], QueryEmbeddingCache("test:model", maxsize=8))
+
+        assert vectors == [[1.0], [2.0]]
+        model.embed_documents.assert_called_once_with(["a", "b"], task_type="RETRIEVAL_QUERY")
+        model.embed_query.assert_not_called()
+
+    async def test_retriever_queries_hit_the_cache(self):
+        """
+        Verify repeated `embed_query` / `aembed_query` calls (the retriever
+        path) reach the provider once and still return unit vectors.
+        """
+        inner = MagicMock()
+        inner.embed_query.return_value = [3.0, 4.0]
+        inner.aembed_query = AsyncMock(return_value=[0.0, 2.0])
+        embeddings = NormalizedEmbeddings(inner, query_cache=QueryEmbeddingCache("test:model", maxsize=8))
+
+        first = embeddings.embed_query("python developer")
+        second = embeddings.embed_query("python developer")
+        third = await embeddings.aembed_query("python developer")
+        fresh = await embeddings.aembed_query("data engineer")
+
+        assert first == second == third == pytest.approx([0.6, 0.8])
+        assert fresh == pytest.approx([0.0, 1.0])
+        inner.embed_query.assert_called_once()
+        inner.aembed_query.assert_awaited_once_with("data engineer")
+
+@pytest.mark.unit
+class TestSemanticQueryCache:
+    """Tests for the near-duplicate search result cache."""
+
+    def test_near_duplicates_hit_and_distant_queries_miss(self):
+        """
+        Verify a query within the threshold reuses cached results (truncated
+        to k), while a distant query or a larger k misses.
+        """
+        cache = SemanticQueryCache(maxsize=4, threshold=0.97)
+        cache.add(normalize_vectors([[1.0, 0.0, 0.0]]), k=3, results=[["a", "b", "c"]])
+
+        hits = cache.lookup(normalize_vectors([[1.0, 0.1, 0.0], [0.0, 1.0, 0.0]]), k=2)
+
+        assert hits == [["a", "b"], None]
+        assert cache.lookup(normalize_vectors([[1.0, 0.0, 0.0]]), k=5) == [None]
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """
+        Verify a full cache replaces the entry that was used least recently.
+        """
+        cache = SemanticQueryCache(maxsize=2, threshold=0.99)
+        cache.add(normalize_vectors([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]), k=1, results=[["x"], ["y"]])
+        cache.lookup(normalize_vectors([[1.0, 0.0, 0.0]]), k=1)
+
+        cache.add(normalize_vectors([[0.0, 0.0, 1.0]]), k=1, results=[["z"]])
+
+        assert cache.lookup(normalize_vectors([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]), k=1) == [
+            ["x"], None, ["z"]
+        ]
+
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    @patch("src.retrieval.vector_db.settings")
+    def test_repeated_search_skips_the_index(self, mock_settings, mock_get_model, tmp_path):
+        """
+        Verify a batched search serves a repeated query from the semantic
+        cache and sends only the new query to the index, and that
+        re-ingesting (through this or another wrapper) clears the cache.
+        """
+        mock_settings.vector_db_path = str(tmp_path / "faiss")
+        mock_settings.embedding_dtype = "fp32"
+        mock_settings.faiss_index_type = "flat"
+        mock_settings.faiss_rerank_factor = 0
+        mock_settings.faiss_mmap = True
+        mock_settings.query_embedding_cache_size = 16
+        mock_settings.query_embedding_cache_dir = None
+        mock_settings.semantic_cache_size = 16
+        mock_settings.semantic_cache_threshold = 0.97
+        mock_settings.embedding_batch_size = 4
+        mock_settings.embedding_max_workers = 1
+        mock_settings.document_embedding_cache_path = None
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        mock_get_model.return_value = DeterministicFakeEmbedding(size=32)
+        docs = [Document(page_content=f"job {i}") for i in range(10)]
+        db = FaissVectorDB()
+        db.create_vector_store(docs)
+
+        first = db.batch_similarity_search(["job 3"], k=2)
+        with patch.object(db, "_search_vectors", wraps=db._search_vectors) as search:
+            second = db.batch_similarity_search(["job 3", "job 7"], k=2)
+            db.create_vector_store(docs)
+            db.batch_similarity_search(["job 3"], k=2)
+            FaissVectorDB().create_vector_store(docs)
+            db.batch_similarity_search(["job 3"], k=2)
+
+        assert second[0] == first[0]
+        assert second[1][0][0].page_content == "job 7"
+        assert [len(c.args[0]) for c in search.call_args_list] == [1, 1, 1]
+
+    @patch("src.retrieval.vector_db._get_embedding_model")
+    @patch("src.retrieval.vector_db.settings")
+    def test_store_generation_is_persisted_per_ingestion(self, mock_settings, mock_get_model, tmp_path):
+        """
+        Verify every ingestion, even a failed one, writes a new generation next
+        to the store, so caches in other processes (the API) see it.
+        """
+        mock_settings.vector_db_path = str(tmp_path / "faiss")
+        mock_settings.embedding_dtype = "fp32"
+        mock_settings.faiss_index_type = "flat"
+        mock_settings.faiss_rerank_factor = 0
+        mock_settings.query_embedding_cache_size = 16
+        mock_settings.query_embedding_cache_dir = None
+        mock_settings.semantic_cache_size = 0
+        mock_settings.embedding_batch_size = 4
+        mock_settings.embedding_max_workers = 1
+        mock_settings.document_embedding_cache_path = None
+        mock_settings.embedding_provider = EmbeddingProvider.OPENAI
+        model = MagicMock(wraps=DeterministicFakeEmbedding(size=32))
+        mock_get_model.return_value = model
+        docs = [Document(page_content=f"job {i}") for i in range(3)]
+        generations = [vector_db.store_generation()]
+
+        FaissVectorDB().create_vector_store(docs)
+        generations.append(vector_db.store_generation())
+        FaissVectorDB().create_vector_store(docs)
+        generations.append(vector_db.store_generation())
+        model.embed_documents.side_effect = RuntimeError("rate limited")
+        with pytest.raises(RuntimeError):
+            FaissVectorDB().create_vector_store(docs)
+        generations.append(vector_db.store_generation())
+
+        assert generations[0] == ""
+        assert len(set(generations)) == 4
@@ -8,23 +8,53 @@ import logging
 import pytest
 from src.utils import setup_logger
 
+@pytest.fixture
+def test_logger_name():
+    """
+    Yields a logger name for the test, then detaches that logger's handlers.
+
+    `setup_logger` is memoized, so its cache is cleared as well; otherwise a
+    repeated run (pytest-repeat, tox matrix) would get back the stripped logger.
+    """
+    name = "test_logger"
+    yield name
+    logging.getLogger(name).handlers.clear()
+    setup_logger.cache_clear()
+
 @pytest.mark.unit
 class TestUtils:
     """Tests for the logging utility."""
 
-    def test_setup_logger_creation(self):
+    def test_setup_logger_creation(self, test_logger_name):
         """
         Verify that the logger is correctly initialized.
         
         Ensures that calling setup_logger returns a standard Python logging object
         configured with the specified name, allowing for consistent log tagging.
         """
-        logger = setup_logger("test_logger")
+        logger = setup_logger(test_logger_name)
         
         # Assert type and name
         assert isinstance(logger, logging.Logger)
-        assert logger.name == "test_logger"
+        assert logger.name == test_logger_name
         
         # Verify it has handlers attached (console handler)
         # Without handlers, logs would be swallowed silently
-        assert len(logger.handlers) > 0
\ No newline at end of file
+        assert len(logger.handlers) > 0
+
+    def test_setup_logger_is_idempotent(self, test_logger_name):
+        """
+        Verify repeated calls return the same logger without adding handlers,
+        so each record is printed once.
+        """
+        first = setup_logger(test_logger_name)
+        initial_count = len(first.handlers)
+        second = setup_logger(test_logger_name)
+
+        assert first is second
+        assert initial_count == 1
+        assert len(second.handlers) == initial_count
+
+        # A cache miss on an already configured logger adds no second handler
+        setup_logger.cache_clear()
+        assert len(setup_logger(test_logger_name).handlers) == initial_count